@@ -1,34 +1,77 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth.cache import token_cache, user_cache
 from app.auth.routes import router as auth_router
+from app.auth.services import password_hash_pool
 from app.core.exception_handlers import (
     auth_failed_handler,
+    bad_request_handler,
     global_exception_handler,
     permission_denied_handler,
+    precondition_failed_handler,
     resource_exists_handler,
     resource_not_found_handler,
 )
 from app.core.exceptions import (
     AuthenticationFailedError,
+    BadRequestError,
     PermissionDeniedError,
+    PreconditionFailedError,
     ResourceAlreadyExistsError,
     ResourceNotFoundError,
 )
-from app.core.middleware import ResponseTimeMiddleware
+from app.core.middleware import (
+    LoadShedder,
+    LoadSheddingMiddleware,
+    ResponseTimeMiddleware,
+)
 from app.core.settings import settings
+from app.posts.cache import post_cache
 from app.posts.routes import router as posts_router
+from app.tags.catalog import tag_catalog
 from app.tags.routes import router as tags_router
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    listener = (
+        asyncio.create_task(tag_catalog.listen())
+        if settings.TAG_CATALOG_LISTEN
+        else None
+    )
+    yield
+    if listener is not None:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    password_hash_pool.shutdown()
+
+
 def create_app() -> FastAPI:
     logging.basicConfig(level=logging.INFO)
     app = FastAPI(
         title=settings.APP_NAME,
         version=settings.APP_VERSION,
         debug=settings.DEBUG,
+        lifespan=lifespan,
+    )
+
+    load_shedder = LoadShedder(
+        prefix=settings.API_V1_PREFIX,
+        limits=settings.LOAD_SHED_CONCURRENCY if settings.LOAD_SHED_ENABLED else {},
+        max_queue=settings.LOAD_SHED_MAX_QUEUE,
+        target_delay_ms=settings.LOAD_SHED_TARGET_DELAY_MS,
+        interval_ms=settings.LOAD_SHED_INTERVAL_MS,
+    )
+    app.add_middleware(
+        LoadSheddingMiddleware,
+        shedder=load_shedder,
+        retry_after=settings.LOAD_SHED_RETRY_AFTER_SECONDS,
     )
 
     app.add_middleware(
@@ -45,6 +88,8 @@ def create_app() -> FastAPI:
     app.add_exception_handler(ResourceAlreadyExistsError, resource_exists_handler)
     app.add_exception_handler(PermissionDeniedError, permission_denied_handler)
     app.add_exception_handler(AuthenticationFailedError, auth_failed_handler)
+    app.add_exception_handler(BadRequestError, bad_request_handler)
+    app.add_exception_handler(PreconditionFailedError, precondition_failed_handler)
     app.add_exception_handler(Exception, global_exception_handler)
 
     app.include_router(auth_router, prefix=settings.API_V1_PREFIX)
@@ -63,6 +108,17 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "healthy"}
 
+    @app.get("/metrics")
+    async def metrics():
+        return {
+            "password_hash_pool": password_hash_pool.stats(),
+            "user_cache": user_cache.stats(),
+            "token_cache": token_cache.stats(),
+            "load_shedding": load_shedder.stats(),
+            "response_cache": await post_cache.stats(),
+            "tag_catalog": tag_catalog.stats(),
+        }
+
     return app
 
 
@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import logging
+
+from app.archival.models import TARGETS
+from app.core.archival import run_archival
+from app.core.db import engine
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        totals = await run_archival(
+            TARGETS,
+            args.older_than_days,
+            args.batch_size,
+            args.pause,
+            args.hard_delete,
+            args.max_batches,
+        )
+    finally:
+        await engine.dispose()
+    action = "deleted" if args.hard_delete else "archived"
+    for table_name, moved in totals.items():
+        logger.info("%s: %d rows %s", table_name, moved, action)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move soft-deleted posts and tags out of the hot tables."
+    )
+    parser.add_argument(
+        "--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument(
+        "--pause", type=float, default=settings.ARCHIVE_BATCH_PAUSE_SECONDS
+    )
+    parser.add_argument("--max-batches", type=int, default=None)
+    parser.add_argument(
+        "--hard-delete",
+        action="store_true",
+        help="Delete rows instead of copying them to the archive tables.",
+    )
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
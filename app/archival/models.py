@@ -0,0 +1,53 @@
+from sqlalchemy import Column, DateTime, String, Table, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.archival import ArchivalTarget, archived_at
+from app.core.db import Base
+from app.posts.models import Post, post_tags
+from app.tags.models import Tag
+
+posts_archive = Table(
+    "posts_archive",
+    Base.metadata,
+    Column("entity_id", UUID(as_uuid=True), primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("user_id", UUID(as_uuid=True), nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+    Column("deleted_at", DateTime(timezone=True), nullable=True),
+    archived_at(),
+)
+
+tags_archive = Table(
+    "tags_archive",
+    Base.metadata,
+    Column("entity_id", UUID(as_uuid=True), primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("user_id", UUID(as_uuid=True), nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+    Column("deleted_at", DateTime(timezone=True), nullable=True),
+    archived_at(),
+)
+
+post_tags_archive = Table(
+    "post_tags_archive",
+    Base.metadata,
+    Column("post_id", UUID(as_uuid=True), primary_key=True),
+    Column("tag_id", UUID(as_uuid=True), primary_key=True),
+    archived_at(),
+)
+
+
+# Posts go first so their links leave with them before tags are considered.
+# Both change what post listings show: posts directly, tags through the
+# embedded tag lists.
+TARGETS = (
+    ArchivalTarget(
+        Post, posts_archive, post_tags.c.post_id, post_tags_archive, Post.__tablename__
+    ),
+    ArchivalTarget(
+        Tag, tags_archive, post_tags.c.tag_id, post_tags_archive, Post.__tablename__
+    ),
+)
@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.auth.models import User
+from app.core.cache import TTLCache
+from app.core.settings import settings
+
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# Keyed by the SHA-256 digest of the bearer token; each entry carries its own
+# TTL taken from the token's exp claim.
+token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    user_cache.delete(user_id)
+
+
+def invalidate_all_users() -> None:
+    user_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(_mapper, _connection, target: User) -> None:
+    invalidate_user(target.entity_id)
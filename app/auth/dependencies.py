@@ -1,40 +1,67 @@
+import hashlib
+import time
 from typing import Annotated
+from uuid import UUID
 
+import jwt
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.cache import token_cache, user_cache
 from app.auth.models import User
-from app.auth.services import AuthService
-from app.core.db import async_session
+from app.auth.services import INVALID_CREDENTIALS_MESSAGE, AuthService
+from app.core.db import get_session
 from app.core.exceptions import AuthenticationFailedError
+from app.core.settings import settings
 
 bearer_scheme = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
-) -> User:
-    token = credentials.credentials
-    try:
-        import jwt
-
-        from app.core.settings import settings
+def _decode_token(token: str) -> UUID:
+    token_key = hashlib.sha256(token.encode("utf-8")).digest()
+    user_uuid = token_cache.get(token_key)
+    if user_uuid is not None:
+        return user_uuid
 
+    try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise AuthenticationFailedError("Could not validate credentials")
-        from uuid import UUID
-
+        user_id = payload.get("sub")
+        # A validly signed token can still carry a non-string sub, which
+        # UUID() would reject with TypeError/AttributeError instead.
+        if not isinstance(user_id, str):
+            raise AuthenticationFailedError(INVALID_CREDENTIALS_MESSAGE)
         user_uuid = UUID(user_id)
-    except jwt.PyJWTError:
-        raise AuthenticationFailedError("Could not validate credentials") from None
-
-    async with async_session() as session:
-        auth_service = AuthService(session)
-        user = await auth_service.get_user_by_id(user_uuid)
-        if user is None:
-            raise AuthenticationFailedError("Could not validate credentials")
+    except (jwt.PyJWTError, ValueError):
+        raise AuthenticationFailedError(INVALID_CREDENTIALS_MESSAGE) from None
+
+    # Only tokens that expire are cached, and never past their own exp claim.
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        ttl = float(expires_at) - time.time()
+        if ttl > 0:
+            token_cache.set(token_key, user_uuid, ttl=ttl)
+    return user_uuid
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> User:
+    user_uuid = _decode_token(credentials.credentials)
+
+    user = user_cache.get(user_uuid)
+    if user is not None:
+        return user
+
+    auth_service = AuthService(session)
+    user = await auth_service.get_user_by_id(user_uuid)
+    if user is None:
+        raise AuthenticationFailedError(INVALID_CREDENTIALS_MESSAGE)
+    # The cached instance is shared across requests, so it must not stay
+    # attached to this request's session.
+    session.expunge(user)
+    user_cache.set(user_uuid, user)
     return user
@@ -5,45 +5,71 @@ from uuid import UUID
 import bcrypt
 import jwt
 from fastapi.security import HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User
 from app.auth.schemas import UserCreate, UserLogin
+from app.core.exceptions import ResourceAlreadyExistsError
+from app.core.executors import WorkerPool
 from app.core.settings import settings
 
 bearer_scheme = HTTPBearer()
 
 INVALID_CREDENTIALS_MESSAGE = "Could not validate credentials"
 
+password_hash_pool = WorkerPool(
+    "password_hash",
+    settings.PASSWORD_HASH_EXECUTOR,
+    settings.PASSWORD_HASH_WORKERS,
+)
+
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(
+        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
 
 class AuthService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def create_user(self, user_data: UserCreate) -> User:
-        hashed_password = self.hash_password(user_data.password)
-        user = User(
-            name=user_data.name,
-            last_name=user_data.last_name,
-            email=user_data.email,
-            hashed_password=hashed_password,
+        hashed_password = await self.hash_password(user_data.password)
+        stmt = (
+            insert(User)
+            .values(
+                name=user_data.name,
+                last_name=user_data.last_name,
+                email=user_data.email,
+                hashed_password=hashed_password,
+            )
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User)
         )
-        self.session.add(user)
+        result = await self.session.execute(stmt)
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise ResourceAlreadyExistsError("Email already registered")
         await self.session.commit()
-        await self.session.refresh(user)
         return user
 
     async def authenticate_user(self, login_data: UserLogin) -> User | None:
         user = await self.get_user_by_email(login_data.email)
-        if not user or not self.verify_password(
+        if not user or not await self.verify_password(
             login_data.password, user.hashed_password
         ):
             return None
         return user
 
     async def get_user_by_email(self, email: str) -> User | None:
-        stmt = select(User).where(User.email == email)
+        stmt = select(User).where(func.lower(User.email) == func.lower(email))
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -53,13 +79,13 @@ class AuthService:
         return result.scalar_one_or_none()
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    async def hash_password(password: str) -> str:
+        return await password_hash_pool.run(_hash_password, password)
 
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        return await password_hash_pool.run(
+            _verify_password, plain_password, hashed_password
         )
 
     @staticmethod
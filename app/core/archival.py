@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Column, DateTime, Table, delete, func, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.counters import adjust_row_count, bump_change_count
+from app.core.db import async_session
+from app.core.mixins import INCLUDE_DELETED
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# lock_not_available and query_canceled: a batch hit ARCHIVE_LOCK_TIMEOUT_MS or
+# ARCHIVE_STATEMENT_TIMEOUT_MS and is retried after a pause.
+TIMEOUT_SQLSTATES = {"55P03", "57014"}
+
+
+def archived_at() -> Column:
+    return Column(
+        "archived_at",
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+@dataclass(frozen=True)
+class ArchivalTarget:
+    # A soft-deletable model, the table its rows move to, the link table
+    # column pointing at it (its rows move along to ``link_archive``), and
+    # the change counter key whose listings the move alters.
+    model: type[Any]
+    archive: Table
+    link_column: Column
+    link_archive: Table
+    change_key: str
+
+
+async def archive_batch(
+    session: AsyncSession,
+    target: ArchivalTarget,
+    cutoff: datetime,
+    batch_size: int,
+    hard_delete: bool,
+) -> int:
+    for name, value in (
+        ("lock_timeout", settings.ARCHIVE_LOCK_TIMEOUT_MS),
+        ("statement_timeout", settings.ARCHIVE_STATEMENT_TIMEOUT_MS),
+    ):
+        await session.execute(select(func.set_config(name, f"{value}ms", True)))
+
+    # SKIP LOCKED leaves rows that live traffic is touching for a later batch
+    # instead of waiting on them.
+    model = target.model
+    result = await session.execute(
+        select(model.entity_id)
+        .where(model.is_deleted, model.deleted_at < cutoff)
+        .order_by(model.deleted_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .execution_options(**{INCLUDE_DELETED: True})
+    )
+    entity_ids = result.scalars().all()
+    if not entity_ids:
+        return 0
+
+    table = model.__table__
+    delete_links = delete(target.link_column.table).where(
+        target.link_column.in_(entity_ids)
+    )
+    delete_rows = delete(table).where(table.c.entity_id.in_(entity_ids))
+    if hard_delete:
+        await session.execute(delete_links)
+        await session.execute(delete_rows)
+    else:
+        for statement, archive in (
+            (delete_links, target.link_archive),
+            (delete_rows, target.archive),
+        ):
+            columns = [
+                column.name
+                for column in archive.columns
+                if column.name != "archived_at"
+            ]
+            moved = statement.returning(*(statement.table.c[name] for name in columns))
+            await session.execute(
+                insert(archive).from_select(columns, select(moved.cte()))
+            )
+    await adjust_row_count(session, table.name, deleted=-len(entity_ids))
+    await bump_change_count(session, target.change_key)
+    return len(entity_ids)
+
+
+async def run_archival(
+    targets: Sequence[ArchivalTarget],
+    older_than_days: int,
+    batch_size: int,
+    pause: float,
+    hard_delete: bool = False,
+    max_batches: int | None = None,
+) -> dict[str, int]:
+    # Every batch commits on its own and the next one selects whatever is
+    # still eligible, so an interrupted run simply resumes when restarted.
+    cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
+    totals: dict[str, int] = {}
+    batches = 0
+    for target in targets:
+        table_name = target.model.__tablename__
+        totals[table_name] = 0
+        retries = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                async with async_session() as session:
+                    moved = await archive_batch(
+                        session, target, cutoff, batch_size, hard_delete
+                    )
+                    await session.commit()
+            except DBAPIError as exc:
+                sqlstate = getattr(exc.orig, "sqlstate", None)
+                if (
+                    sqlstate not in TIMEOUT_SQLSTATES
+                    or retries >= settings.ARCHIVE_MAX_RETRIES
+                ):
+                    raise
+                retries += 1
+                logger.warning("Archival batch on %s timed out, retrying", table_name)
+                await asyncio.sleep(pause * 2**retries)
+                continue
+
+            retries = 0
+            if not moved:
+                break
+            batches += 1
+            totals[table_name] += moved
+            logger.info("Archived %d rows from %s", moved, table_name)
+            await asyncio.sleep(pause)
+    return totals
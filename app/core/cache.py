@@ -0,0 +1,268 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from app.core.db import DB_UNAVAILABLE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Any) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def values(self) -> list[Any]:
+        with self._lock:
+            return [value for value, _ in self._data.values()]
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+    async def stats(self) -> dict[str, Any]: ...
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int):
+        self._cache = TTLCache(max_size=max_entries)
+        # Kept outside the LRU: an evicted counter would restart at zero and
+        # resurrect entries written under an old generation.
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._cache),
+            "max_entries": self._cache.max_size,
+            "memory_bytes": sum(len(value) for value in self._cache.values()),
+            "evictions": self._cache.evictions,
+        }
+
+
+class RedisCacheBackend:
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the 'redis' package"
+            ) from exc
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, ex=max(1, math.ceil(ttl)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def stats(self) -> dict[str, Any]:
+        info = await self._client.info("memory")
+        return {
+            "backend": "redis",
+            "entries": await self._client.dbsize(),
+            "memory_bytes": info.get("used_memory"),
+        }
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+
+
+class ReadThroughCache:
+    # Entries outlive their freshness by ``stale_ttl`` so they can still be
+    # served while the database is unreachable.
+    def __init__(
+        self, backend: CacheBackend, namespace: str, ttl: float, stale_ttl: float
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.backend_errors = 0
+
+    def key(self, *parts: Any) -> str:
+        return ":".join((self.namespace, *(str(part) for part in parts)))
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[CachedResponse]]
+    ) -> CachedResponse:
+        cached = await self._read(key)
+        if cached is not None and cached[1]:
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        try:
+            entry = await loader()
+        except DB_UNAVAILABLE_ERRORS:
+            if cached is None:
+                raise
+            self.stale_served += 1
+            logger.warning("Database unavailable, serving stale cache entry %s", key)
+            return cached[0]
+        await self._write(key, entry)
+        return entry
+
+    async def invalidate(self, *keys: str) -> None:
+        try:
+            await self.backend.delete(*keys)
+        except Exception:
+            self.backend_errors += 1
+            logger.exception("Cache invalidation failed")
+
+    async def generation(self, name: str) -> int:
+        try:
+            return int(await self.backend.get(self.key("gen", name)) or 0)
+        except Exception:
+            self.backend_errors += 1
+            return 0
+
+    async def bump_generation(self, name: str) -> None:
+        try:
+            await self.backend.incr(self.key("gen", name))
+        except Exception:
+            self.backend_errors += 1
+            logger.exception("Cache generation bump failed")
+
+    async def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        try:
+            backend_stats = await self.backend.stats()
+        except Exception:
+            backend_stats = {}
+        return {
+            **backend_stats,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stale_served": self.stale_served,
+            "backend_errors": self.backend_errors,
+        }
+
+    async def _read(self, key: str) -> tuple[CachedResponse, bool] | None:
+        try:
+            raw = await self.backend.get(key)
+        except Exception:
+            self.backend_errors += 1
+            return None
+        if raw is None:
+            return None
+        fresh_until, headers, body = raw.split(b"\n", 2)
+        entry = CachedResponse(body=body, headers=json.loads(headers))
+        return entry, float(fresh_until) > time.time()
+
+    async def _write(self, key: str, entry: CachedResponse) -> None:
+        raw = b"\n".join(
+            (
+                str(time.time() + self.ttl).encode(),
+                json.dumps(entry.headers).encode(),
+                entry.body,
+            )
+        )
+        try:
+            await self.backend.set(key, raw, ttl=self.ttl + self.stale_ttl)
+        except Exception:
+            self.backend_errors += 1
+            logger.exception("Cache write failed")
+
+
+def create_cache_backend(kind: str, url: str | None, max_entries: int) -> CacheBackend:
+    if kind == "redis":
+        return RedisCacheBackend(url)
+    return MemoryCacheBackend(max_entries)
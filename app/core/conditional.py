@@ -0,0 +1,84 @@
+import hashlib
+import re
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.core.exceptions import PreconditionFailedError
+
+# Versioned entity tags look like "<version>.<digest>", so If-Match can be
+# mapped back to the row version it was issued for.
+VERSIONED_ETAG = re.compile(r'"(\d+)\.[0-9a-f]+"')
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def make_versioned_etag(version: int, *parts: Any) -> str:
+    digest = make_etag(*parts).strip('"')
+    return f'"{version}.{digest}"'
+
+
+def if_match_versions(request: Request) -> list[int] | None:
+    # None means the update is unconditional (no header, or "*"). If-Match
+    # uses strong comparison, so weak or foreign tags can never match.
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return None
+        match = VERSIONED_ETAG.fullmatch(tag)
+        if match:
+            versions.append(int(match[1]))
+    if not versions:
+        raise PreconditionFailedError("Resource has been modified")
+    return versions
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(UTC), usegmt=True
+        )
+    return headers
+
+
+def header_last_modified(headers: dict[str, str]) -> datetime | None:
+    value = headers.get("Last-Modified")
+    return parsedate_to_datetime(value) if value else None
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have one-second resolution.
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,219 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ColumnElement,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Select,
+    SmallInteger,
+    String,
+    func,
+    literal_column,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import UUID, Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+# Every post or tag write bumps its table's counters, so one row per key would
+# serialize all writers on it. Each key of row_counts and change_counts is
+# split across this many slot rows, summed on read; raising it later is safe,
+# lowering it needs the extra slots folded into the remaining ones.
+COUNTER_SLOTS = 16
+
+
+def _counter_slot() -> ColumnElement[int]:
+    # The backend pid spreads concurrent connections over different rows,
+    # while every write within one transaction reuses the same row per key
+    # and so keeps the lock order described at tag_post_count_upsert.
+    return func.pg_backend_pid() % COUNTER_SLOTS
+
+
+class RowCount(Base):
+    __tablename__ = "row_counts"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    slot: Mapped[int] = mapped_column(
+        SmallInteger, primary_key=True, default=0, server_default="0"
+    )
+    total: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+
+
+async def adjust_row_count(
+    session: AsyncSession, table_name: str, live: int = 0, deleted: int = 0
+) -> None:
+    # Runs inside the caller's transaction so the counter commits (or rolls
+    # back) together with the rows it describes.
+    slot = _counter_slot()
+    rows = [
+        {
+            "table_name": table_name,
+            "is_deleted": is_deleted,
+            "slot": slot,
+            "total": delta,
+        }
+        for is_deleted, delta in ((False, live), (True, deleted))
+        if delta
+    ]
+    if not rows:
+        return
+    stmt = insert(RowCount).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RowCount.table_name, RowCount.is_deleted, RowCount.slot],
+        set_={"total": RowCount.total + stmt.excluded.total},
+    )
+    await session.execute(stmt)
+
+
+class ChangeCount(Base):
+    # Committed writes that changed what a key's listings show. The sum moves
+    # exactly when such a commit becomes visible, which max(updated_at)
+    # cannot promise: now() is the transaction's start, so a long transaction
+    # can commit a timestamp older than one a reader has already seen.
+    __tablename__ = "change_counts"
+
+    name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    slot: Mapped[int] = mapped_column(
+        SmallInteger, primary_key=True, default=0, server_default="0"
+    )
+    total: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+async def bump_change_count(session: AsyncSession, name: str) -> None:
+    # The last write before commit: it takes the final lock in the order
+    # described at tag_post_count_upsert, and clock_timestamp() is as close to
+    # the commit as a statement can get.
+    stmt = insert(ChangeCount).values(
+        name=name, slot=_counter_slot(), total=1, changed_at=func.clock_timestamp()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ChangeCount.name, ChangeCount.slot],
+        set_={
+            "total": ChangeCount.total + 1,
+            "changed_at": stmt.excluded.changed_at,
+        },
+    )
+    await session.execute(stmt)
+
+
+class TagPostCount(Base):
+    # Live posts carrying each tag, so popularity is read from an index
+    # instead of a GROUP BY over post_tags. Rows appear on a tag's first link.
+    __tablename__ = "tag_post_counts"
+    __table_args__ = (
+        Index("ix_tag_post_counts_post_count_tag_id", "post_count", "tag_id"),
+    )
+
+    tag_id: Mapped[Any] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tags.entity_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    post_count: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    # The count is part of a tag's representation, so its changes have to
+    # move the tag's Last-Modified too.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+def tag_post_count(tag_id: ColumnElement[Any]) -> ColumnElement[int]:
+    return func.coalesce(
+        select(TagPostCount.post_count)
+        .where(TagPostCount.tag_id == tag_id)
+        .correlate_except(TagPostCount)
+        .scalar_subquery(),
+        0,
+    )
+
+
+def _add_to_tag_post_counts(stmt: Insert) -> Insert:
+    return stmt.on_conflict_do_update(
+        index_elements=[TagPostCount.tag_id],
+        set_={
+            "post_count": TagPostCount.post_count + stmt.excluded.post_count,
+            "updated_at": func.now(),
+        },
+    )
+
+
+def tag_post_count_upsert(*changes: tuple[Select, int]) -> Insert:
+    # Each change pairs a SELECT of tag ids with the delta every row applies.
+    # Deltas are summed per tag first because one INSERT ... ON CONFLICT
+    # cannot touch the same row twice. Every write path locks counters in one
+    # global order, row_counts first, then tag_post_counts in tag order, then
+    # change_counts, so concurrent writers cannot deadlock on them. Usable on
+    # its own or as a data-modifying CTE next to the link change.
+    deltas = union_all(
+        *(
+            select(
+                tag_ids.subquery().c[0].label("tag_id"),
+                literal_column(str(int(delta)), Integer).label("delta"),
+            )
+            for tag_ids, delta in changes
+        )
+    ).subquery()
+    return _add_to_tag_post_counts(
+        insert(TagPostCount).from_select(
+            ["tag_id", "post_count"],
+            select(deltas.c.tag_id, func.sum(deltas.c.delta))
+            .group_by(deltas.c.tag_id)
+            .order_by(deltas.c.tag_id),
+        )
+    )
+
+
+async def get_row_count(
+    session: AsyncSession, table_name: str, is_deleted: bool = False
+) -> int:
+    result = await session.execute(
+        select(func.coalesce(func.sum(RowCount.total), 0)).where(
+            RowCount.table_name == table_name, RowCount.is_deleted == is_deleted
+        )
+    )
+    return max(int(result.scalar_one()), 0)
+
+
+async def get_change_count(
+    session: AsyncSession, name: str
+) -> tuple[int, datetime | None]:
+    result = await session.execute(
+        select(
+            func.coalesce(func.sum(ChangeCount.total), 0),
+            func.max(ChangeCount.changed_at),
+        ).where(ChangeCount.name == name)
+    )
+    total, changed_at = result.one()
+    return int(total), changed_at
+
+
+async def estimate_row_count(session: AsyncSession, stmt: Select) -> int:
+    compiled = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan: Any = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
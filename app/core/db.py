@@ -1,8 +1,42 @@
+import logging
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.settings import settings
 
+logger = logging.getLogger(__name__)
+
+# Errors that mean Postgres itself is unreachable rather than a bad query.
+DB_UNAVAILABLE_ERRORS = (
+    OSError,
+    TimeoutError,
+    exc.OperationalError,
+    exc.InterfaceError,
+    exc.TimeoutError,
+)
+
+
+@dataclass(slots=True)
+class StatementBudget:
+    limit: int
+    label: str
+    count: int = 0
+
+    @property
+    def message(self) -> str:
+        return f"{self.label} issued {self.count} SQL statements (budget {self.limit})"
+
+
+_statement_budget: ContextVar[StatementBudget | None] = ContextVar(
+    "statement_budget", default=None
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -23,3 +57,34 @@ async_session = sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    # FastAPI caches this dependency per request, so authentication and the
+    # handler share one session. AsyncSession only checks out a pooled
+    # connection on first use, so endpoints that never query cost nothing.
+    async with async_session() as session:
+        yield session
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(*_args) -> None:
+    budget = _statement_budget.get()
+    if budget is not None:
+        budget.count += 1
+
+
+@contextmanager
+def statement_budget(limit: int, label: str) -> Iterator[StatementBudget]:
+    # Counts the SQL statements issued inside the block so a regression in a
+    # hot write path shows up in the logs instead of silently adding round
+    # trips. It never raises: by the time an overrun is known the work may
+    # have committed. Tests under tests/ hold each path to its budget.
+    budget = StatementBudget(limit, label)
+    token = _statement_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _statement_budget.reset(token)
+    if budget.count > limit:
+        logger.warning(budget.message)
@@ -3,7 +3,9 @@ from fastapi.responses import JSONResponse
 
 from app.core.exceptions import (
     AuthenticationFailedError,
+    BadRequestError,
     PermissionDeniedError,
+    PreconditionFailedError,
     ResourceAlreadyExistsError,
     ResourceNotFoundError,
 )
@@ -36,6 +38,18 @@ def auth_failed_handler(_request: Request, exc: AuthenticationFailedError):
     )
 
 
+def bad_request_handler(_request: Request, exc: BadRequestError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST, content={"detail": exc.message}
+    )
+
+
+def precondition_failed_handler(_request: Request, exc: PreconditionFailedError):
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED, content={"detail": exc.message}
+    )
+
+
 def global_exception_handler(_request: Request, exc: Exception):
     # TODO: Add a log here when the logger instance is configured
 
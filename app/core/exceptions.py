@@ -18,3 +18,11 @@ class AuthenticationFailedError(BaseAppError):
 
 class PermissionDeniedError(BaseAppError):
     pass
+
+
+class BadRequestError(BaseAppError):
+    pass
+
+
+class PreconditionFailedError(BaseAppError):
+    pass
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal
+
+ExecutorKind = Literal["thread", "process"]
+
+
+class WorkerPool:
+    def __init__(self, name: str, kind: ExecutorKind, max_workers: int):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._waiting = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        executor = self._get_executor()
+        # Calls beyond max_workers wait here rather than in the executor's
+        # internal queue, so queue depth and wait time stay observable.
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        wait = time.perf_counter() - queued_at
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            self._running -= 1
+            self._completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        started = self._completed + self._running
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "queue_depth": self._waiting,
+            "running": self._running,
+            "completed": self._completed,
+            "avg_wait_ms": (self._total_wait / started * 1000) if started else 0.0,
+            "max_wait_ms": self._max_wait * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
@@ -1,7 +1,15 @@
+import asyncio
+import contextlib
 import logging
+import math
 import time
+from collections import deque
+from typing import Any
 
+from fastapi import status
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
@@ -25,3 +33,165 @@ class ResponseTimeMiddleware(BaseHTTPMiddleware):
             time_str = f"{seconds:.4f} seconds"
         logger.info(f"Request to {request.url} took {time_str}")
         return response
+
+
+class RouteGroupLimiter:
+    # Concurrency limit with a CoDel-style queue: while the minimum queueing
+    # delay over an interval stays above the target, the queue is considered
+    # standing and requests are only allowed to wait ``target_delay``.
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        target_delay: float,
+        interval: float,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.target_delay = target_delay
+        self.interval = interval
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._overloaded = False
+        self._interval_start = time.monotonic()
+        self._interval_min_delay = math.inf
+
+    def _record_delay(self, delay: float) -> None:
+        now = time.monotonic()
+        self._interval_min_delay = min(self._interval_min_delay, delay)
+        if now - self._interval_start >= self.interval:
+            self._overloaded = self._interval_min_delay > self.target_delay
+            self._interval_min_delay = math.inf
+            self._interval_start = now
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            self._record_delay(0.0)
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = time.monotonic()
+        timeout = self.target_delay if self._overloaded else self.interval
+        try:
+            async with asyncio.timeout(timeout):
+                await waiter
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the timeout fired.
+                self.release()
+            else:
+                self._discard(waiter)
+            self.rejected_timeout += 1
+            self._record_delay(time.monotonic() - queued_at)
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+        self.admitted += 1
+        self._record_delay(time.monotonic() - queued_at)
+        return True
+
+    def release(self) -> None:
+        # Hand the slot straight to the next live waiter; in_flight only
+        # drops when nobody is queued.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        with contextlib.suppress(ValueError):
+            self._waiters.remove(waiter)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "overloaded": self._overloaded,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class LoadShedder:
+    def __init__(
+        self,
+        prefix: str,
+        limits: dict[str, int],
+        max_queue: int,
+        target_delay_ms: int,
+        interval_ms: int,
+    ):
+        self._limiters = [
+            (
+                f"{prefix}/{group}",
+                RouteGroupLimiter(
+                    group,
+                    max_concurrency,
+                    max_queue,
+                    target_delay_ms / 1000,
+                    interval_ms / 1000,
+                ),
+            )
+            for group, max_concurrency in limits.items()
+        ]
+
+    def limiter_for(self, path: str) -> RouteGroupLimiter | None:
+        for path_prefix, limiter in self._limiters:
+            if path == path_prefix or path.startswith(f"{path_prefix}/"):
+                return limiter
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        return {limiter.name: limiter.stats() for _, limiter in self._limiters}
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, app: ASGIApp, shedder: LoadShedder, retry_after: int):
+        self.app = app
+        self.shedder = shedder
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.shedder.limiter_for(scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Service overloaded, please retry later."},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
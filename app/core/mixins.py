@@ -1,11 +1,43 @@
+from collections.abc import Callable, Collection, Sequence
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Boolean, DateTime, func, select
+from sqlalchemy import (
+    CTE,
+    BindParameter,
+    Boolean,
+    ColumnElement,
+    DateTime,
+    Integer,
+    Row,
+    Select,
+    any_,
+    bindparam,
+    event,
+    func,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import (
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+    with_loader_criteria,
+)
 
-from app.core.exceptions import ResourceNotFoundError
+from app.core.counters import adjust_row_count, estimate_row_count, get_row_count
+from app.core.db import Base
+from app.core.exceptions import (
+    PermissionDeniedError,
+    PreconditionFailedError,
+    ResourceNotFoundError,
+)
+from app.core.pagination import SortOrder, paginate
+from app.core.settings import settings
 
 
 class TimestampMixin:
@@ -37,6 +69,62 @@ class SoftDeleteMixin:
         self.is_deleted = True
         self.deleted_at = func.now()
 
+    def restore(self):
+        self.is_deleted = False
+        self.deleted_at = None
+
+
+class VersionMixin:
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default="1", nullable=False
+    )
+
+
+INCLUDE_DELETED = "include_deleted"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_soft_deleted(execute_state: ORMExecuteState) -> None:
+    # Every ORM SELECT skips soft-deleted rows, and the criteria propagate to
+    # the relationship loads it triggers, so deleted tags never reach a post.
+    # Statements opt out with execution_options(include_deleted=True), or a
+    # tuple of models whose deleted rows should stay visible.
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+    ):
+        return
+    include_deleted = execute_state.execution_options.get(INCLUDE_DELETED, ())
+    if include_deleted is True:
+        return
+    execute_state.statement = execute_state.statement.options(
+        *(
+            with_loader_criteria(
+                mapper.class_,
+                mapper.class_.is_deleted == False,  # noqa: E712
+                include_aliases=True,
+            )
+            for mapper in Base.registry.mappers
+            if issubclass(mapper.class_, SoftDeleteMixin)
+            and mapper.class_ not in include_deleted
+        )
+    )
+
+
+def uuid_array(name: str, entity_ids: Collection[Any]) -> BindParameter[Any]:
+    return bindparam(name, list(entity_ids), type_=ARRAY(UUID(as_uuid=True)))
+
+
+def id_array(name: str, entity_ids: Collection[Any]) -> ColumnElement[Any]:
+    # One array parameter instead of an IN list, so tens of thousands of ids
+    # stay within the driver's bind parameter limit.
+    return any_(uuid_array(name, entity_ids))
+
+
+def deleted_rows(stmt: Select, model: type[Any]) -> Select:
+    return stmt.where(model.is_deleted).execution_options(**{INCLUDE_DELETED: (model,)})
+
 
 class CRUDMixin:
     def __init__(self, session: AsyncSession):
@@ -44,15 +132,139 @@ class CRUDMixin:
 
     async def create(self, obj: Any) -> Any:
         self.session.add(obj)
+        await adjust_row_count(self.session, obj.__tablename__, live=1)
         await self.session.commit()
         await self.session.refresh(obj)
         return obj
 
     async def get_by_id(self, model: type[Any], entity_id: Any) -> Any:
-        result = await self.session.get(model, entity_id)
-        if not result or result.is_deleted:
+        result = await self.session.execute(
+            select(model).where(model.entity_id == entity_id)
+        )
+        obj = result.scalar_one_or_none()
+        if obj is None:
             raise ResourceNotFoundError("Resource not found")
-        return result
+        return obj
+
+    async def update_owned(
+        self,
+        model: type[Any],
+        entity_id: Any,
+        user_id: Any,
+        values: dict[str, Any],
+        expected_versions: list[int] | None = None,
+        related: Sequence[Callable[[CTE], CTE]] = (),
+        extra_columns: Sequence[Callable[[CTE], ColumnElement[Any]]] = (),
+    ) -> Row:
+        # One statement: a conditional UPDATE ... RETURNING next to a plain
+        # read of the same row, so a miss can be told apart as 404 (no live
+        # row), 403 (someone else's) or 412 (stale If-Match) without a
+        # read-modify-write race. ``related`` builds further data-modifying
+        # CTEs that only touch rows when the update went through, and
+        # ``extra_columns`` adds values computed from the updated row. Callers
+        # of this and soft_delete_owned commit.
+        table = model.__table__
+        live = [table.c.entity_id == entity_id, table.c.is_deleted == False]  # noqa: E712
+        target = select(table.c.user_id).where(*live).cte("target")
+        conditions = [*live, table.c.user_id == user_id]
+        if expected_versions is not None:
+            conditions.append(table.c.version.in_(expected_versions))
+        updated = (
+            update(table)
+            .where(*conditions)
+            .values(**values, version=table.c.version + 1)
+            .returning(*(column for column in table.c if column.computed is None))
+            .cte("updated")
+        )
+        # Unreferenced CTEs are not rendered, so each related one is counted.
+        related_counts = [
+            select(func.count()).select_from(build(updated)).scalar_subquery()
+            for build in related
+        ]
+        result = await self.session.execute(
+            select(
+                target.c.user_id.label("owner_id"),
+                updated,
+                *related_counts,
+                *(build(updated) for build in extra_columns),
+            ).select_from(target.outerjoin(updated, true()))
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise ResourceNotFoundError("Resource not found")
+        if row.entity_id is None:
+            if row.owner_id != user_id:
+                raise PermissionDeniedError("Not authorized")
+            raise PreconditionFailedError("Resource has been modified")
+        return row
+
+    async def soft_delete_owned(
+        self,
+        model: type[Any],
+        entity_id: Any,
+        user_id: Any,
+        expected_versions: list[int] | None = None,
+    ) -> None:
+        await self.update_owned(
+            model,
+            entity_id,
+            user_id,
+            {"is_deleted": True, "deleted_at": func.now()},
+            expected_versions,
+        )
+        await adjust_row_count(self.session, model.__tablename__, live=-1, deleted=1)
+
+    async def set_deleted_owned(
+        self, model: type[Any], entity_ids: Sequence[Any], user_id: Any, deleted: bool
+    ) -> tuple[list[Any], list[Any], list[Any]]:
+        # Soft deletes (or restores) a whole set in one ownership-filtered
+        # UPDATE ... RETURNING, read next to the requested rows so every id is
+        # reported. Returns (affected, not_found, forbidden); the caller
+        # commits.
+        table = model.__table__
+        ids = id_array("entity_ids", entity_ids)
+        target = (
+            select(table.c.entity_id, table.c.user_id)
+            .where(table.c.entity_id == ids, table.c.is_deleted == (not deleted))
+            .cte("target")
+        )
+        updated = (
+            update(table)
+            .where(table.c.entity_id == ids, table.c.is_deleted == (not deleted))
+            .where(table.c.user_id == user_id)
+            .values(
+                is_deleted=deleted,
+                deleted_at=func.now() if deleted else None,
+                version=table.c.version + 1,
+            )
+            .returning(table.c.entity_id)
+            .cte("updated")
+        )
+        result = await self.session.execute(
+            select(
+                target.c.entity_id,
+                target.c.user_id,
+                updated.c.entity_id.label("updated_id"),
+            ).select_from(
+                target.outerjoin(updated, updated.c.entity_id == target.c.entity_id)
+            )
+        )
+        rows = result.all()
+        affected = [row.entity_id for row in rows if row.updated_id is not None]
+        forbidden = [
+            row.entity_id
+            for row in rows
+            if row.updated_id is None and row.user_id != user_id
+        ]
+        reported = {*affected, *forbidden}
+        not_found = [entity_id for entity_id in entity_ids if entity_id not in reported]
+
+        if affected:
+            moved = len(affected) if deleted else -len(affected)
+            await adjust_row_count(
+                self.session, model.__tablename__, live=-moved, deleted=moved
+            )
+        return affected, not_found, forbidden
 
     async def update(self, obj: Any, update_data: dict[str, Any]) -> Any:
         for key, value in update_data.items():
@@ -63,7 +275,56 @@ class CRUDMixin:
 
     async def delete(self, obj: Any) -> None:
         obj.soft_delete()
+        await adjust_row_count(self.session, obj.__tablename__, live=-1, deleted=1)
+        await self.session.commit()
+
+    async def restore(self, obj: Any) -> Any:
+        obj.restore()
+        await adjust_row_count(self.session, obj.__tablename__, live=1, deleted=-1)
         await self.session.commit()
+        await self.session.refresh(obj)
+        return obj
+
+    async def classify_ownership(
+        self, model: type[Any], entity_ids: Collection[Any], user_id: Any
+    ) -> tuple[list[Any], list[Any]]:
+        # Returns (not_found, forbidden) for a set of ids in one query.
+        result = await self.session.execute(
+            select(model.entity_id, model.user_id).where(
+                model.entity_id == id_array("entity_ids", entity_ids)
+            )
+        )
+        owners = dict(result.tuples().all())
+        not_found = [entity_id for entity_id in entity_ids if entity_id not in owners]
+        forbidden = [
+            entity_id for entity_id, owner_id in owners.items() if owner_id != user_id
+        ]
+        return not_found, forbidden
+
+    async def count(
+        self,
+        model: type[Any],
+        only_deleted: bool = False,
+        filters: Sequence[ColumnElement[bool]] = (),
+    ) -> int:
+        # Counters only track whole tables; filtered listings fall back to a
+        # real (or estimated) count.
+        if settings.PAGINATION_TOTAL_MODE == "counter" and not filters:
+            return await get_row_count(self.session, model.__tablename__, only_deleted)
+
+        # The is_deleted condition is spelled out because EXPLAIN is run on
+        # the compiled statement, which bypasses the ORM criteria.
+        conditions = [model.is_deleted == only_deleted, *filters]
+        if settings.PAGINATION_TOTAL_MODE == "estimate":
+            return await estimate_row_count(
+                self.session, select(model.entity_id).where(*conditions)
+            )
+        result = await self.session.execute(
+            select(func.count(model.entity_id))
+            .where(*conditions)
+            .execution_options(**{INCLUDE_DELETED: (model,)})
+        )
+        return result.scalar()
 
     async def list_paginated(
         self,
@@ -71,12 +332,13 @@ class CRUDMixin:
         page: int = 1,
         size: int = 10,
         only_deleted: bool = False,
+        cursor: str | None = None,
+        order: SortOrder = "desc",
+        options: Sequence[Any] = (),
     ) -> list[Any]:
-        stmt = select(model)
+        stmt = select(model).options(*options)
         if only_deleted:
-            stmt = stmt.where(model.is_deleted)
-        else:
-            stmt = stmt.where(model.is_deleted == False)  # noqa: E712
-        stmt = stmt.offset((page - 1) * size).limit(size)
+            stmt = deleted_rows(stmt, model)
+        stmt = paginate(stmt, model, page, size, cursor, order)
         result = await self.session.execute(stmt)
         return result.scalars().all()
@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+
+from app.core.exceptions import BadRequestError
+
+SortOrder = Literal["asc", "desc"]
+
+
+def _encode(values: list[Any]) -> str:
+    raw = json.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> list[Any]:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    values = json.loads(raw)
+    if not isinstance(values, list):
+        raise ValueError("cursor must encode a list")
+    return values
+
+
+def encode_cursor(created_at: datetime, entity_id: UUID) -> str:
+    return _encode([created_at.isoformat(), str(entity_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, entity_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), UUID(entity_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequestError("Invalid cursor") from None
+
+
+def encode_rank_cursor(rank: float, entity_id: UUID) -> str:
+    return _encode([rank, str(entity_id)])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        rank, entity_id = _decode(cursor)
+        return float(rank), UUID(entity_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequestError("Invalid cursor") from None
+
+
+def paginate(
+    stmt: Select,
+    model: type[Any],
+    page: int = 1,
+    size: int = 10,
+    cursor: str | None = None,
+    order: SortOrder = "desc",
+) -> Select:
+    # (created_at, entity_id) is unique and backed by a composite index, so
+    # the order is stable and a cursor seek costs the same on every page.
+    key = tuple_(model.created_at, model.entity_id)
+    if order == "desc":
+        stmt = stmt.order_by(model.created_at.desc(), model.entity_id.desc())
+    else:
+        stmt = stmt.order_by(model.created_at.asc(), model.entity_id.asc())
+
+    if cursor is not None:
+        bound = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < bound if order == "desc" else key > bound)
+    else:
+        stmt = stmt.offset((page - 1) * size)
+    return stmt.limit(size)
+
+
+def next_cursor(items: Sequence[Any], size: int) -> str | None:
+    if len(items) < size:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.entity_id)
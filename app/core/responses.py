@@ -0,0 +1,19 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(JSONResponse):
+    # Handlers validate once when building the model; returning this skips
+    # FastAPI's second response_model pass and renders bytes in pydantic-core.
+    def __init__(
+        self, content: BaseModel, *, exclude_unset: bool = False, **kwargs: Any
+    ):
+        self.exclude_unset = exclude_unset
+        super().__init__(content, **kwargs)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(
+            content, exclude_unset=self.exclude_unset
+        )
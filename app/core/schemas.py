@@ -1,6 +1,7 @@
 from datetime import datetime
+from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TimestampSchema(BaseModel):
@@ -17,4 +18,15 @@ class SoftDeleteSchema(BaseModel):
 
 class PaginatedResponse[T](BaseModel):
     items: list[T]
-    total: int
+    total: int | None = None
+    next_cursor: str | None = None
+
+
+class BulkIds(BaseModel):
+    ids: list[UUID] = Field(min_length=1)
+
+
+class BulkChangeResponse(BaseModel):
+    affected: list[UUID]
+    not_found: list[UUID] = []
+    forbidden: list[UUID] = []
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +25,47 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
 
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = Field(default="thread")
+    PASSWORD_HASH_WORKERS: int = Field(default=4, ge=1)
+
+    USER_CACHE_MAX_SIZE: int = Field(default=10_000, ge=1)
+    USER_CACHE_TTL_SECONDS: float = Field(default=60.0, gt=0)
+    TOKEN_CACHE_MAX_SIZE: int = Field(default=50_000, ge=1)
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis"] = Field(default="memory")
+    RESPONSE_CACHE_URL: str | None = Field(default=None)
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
+    RESPONSE_CACHE_TTL_SECONDS: float = Field(default=30.0, gt=0)
+    RESPONSE_CACHE_STALE_TTL_SECONDS: float = Field(default=300.0, ge=0)
+    RESPONSE_CACHE_MAX_PAGES: int = Field(default=3, ge=0)
+
+    PAGINATION_TOTAL_MODE: Literal["exact", "counter", "estimate"] = Field(
+        default="counter"
+    )
+
+    POST_BULK_MAX_ITEMS: int = Field(default=1000, ge=1)
+    POST_TAGS_BULK_MAX_POSTS: int = Field(default=50_000, ge=1)
+    BULK_DELETE_MAX_IDS: int = Field(default=10_000, ge=1)
+
+    TAG_AUTOCOMPLETE_SOURCE: Literal["database", "memory"] = Field(default="database")
+    TAG_CATALOG_TTL_SECONDS: float = Field(default=300.0, gt=0)
+    TAG_CATALOG_LISTEN: bool = Field(default=True)
+
+    LOAD_SHED_ENABLED: bool = Field(default=True)
+    LOAD_SHED_CONCURRENCY: dict[str, int] = Field(
+        default={"auth": 16, "posts": 64, "tags": 32}
+    )
+    LOAD_SHED_MAX_QUEUE: int = Field(default=128, ge=0)
+    LOAD_SHED_TARGET_DELAY_MS: int = Field(default=50, ge=1)
+    LOAD_SHED_INTERVAL_MS: int = Field(default=500, ge=1)
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = Field(default=1, ge=0)
+
+    ARCHIVE_AFTER_DAYS: int = Field(default=30, ge=0)
+    ARCHIVE_BATCH_SIZE: int = Field(default=500, ge=1)
+    ARCHIVE_BATCH_PAUSE_SECONDS: float = Field(default=0.5, ge=0)
+    ARCHIVE_LOCK_TIMEOUT_MS: int = Field(default=2000, ge=1)
+    ARCHIVE_STATEMENT_TIMEOUT_MS: int = Field(default=30_000, ge=1)
+    ARCHIVE_MAX_RETRIES: int = Field(default=5, ge=0)
+
     BACKEND_CORS_ORIGINS: list[str] = Field(default=["http://localhost:3000"])
 
     POSTGRES_DB: str = Field(default="fastapi_challenge")
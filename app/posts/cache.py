@@ -0,0 +1,55 @@
+from collections.abc import Collection
+from urllib.parse import urlencode
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import QueryParams
+
+from app.core.cache import ReadThroughCache, create_cache_backend
+from app.core.mixins import id_array
+from app.core.settings import settings
+from app.posts.models import post_tags
+
+LISTING_GENERATION = "list"
+
+# Single posts are invalidated by key; listings are keyed by a generation
+# number that every post or tag write bumps, so no page has to be found.
+post_cache = ReadThroughCache(
+    create_cache_backend(
+        settings.RESPONSE_CACHE_BACKEND,
+        settings.RESPONSE_CACHE_URL,
+        settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ),
+    namespace="posts",
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    stale_ttl=settings.RESPONSE_CACHE_STALE_TTL_SECONDS,
+)
+
+
+def post_key(entity_id: UUID) -> str:
+    return post_cache.key("post", entity_id)
+
+
+async def listing_key(query_params: QueryParams) -> str:
+    generation = await post_cache.generation(LISTING_GENERATION)
+    return post_cache.key(
+        "list", generation, urlencode(sorted(query_params.multi_items()))
+    )
+
+
+async def invalidate_posts(*entity_ids: UUID) -> None:
+    if entity_ids:
+        await post_cache.invalidate(*(post_key(entity_id) for entity_id in entity_ids))
+    await post_cache.bump_generation(LISTING_GENERATION)
+
+
+async def invalidate_posts_with_tags(
+    session: AsyncSession, tag_ids: Collection[UUID]
+) -> None:
+    result = await session.execute(
+        select(post_tags.c.post_id.distinct()).where(
+            post_tags.c.tag_id == id_array("tag_ids", tag_ids)
+        )
+    )
+    await invalidate_posts(*result.scalars().all())
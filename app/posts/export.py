@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from app.core.db import async_session
+from app.posts.models import Post
+from app.posts.services import PostService
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = [
+    "entity_id",
+    "title",
+    "content",
+    "created_at",
+    "updated_at",
+    "user_id",
+    "user_email",
+    "tags",
+]
+
+
+def _export_row(post: Post) -> dict[str, Any]:
+    return {
+        "entity_id": str(post.entity_id),
+        "title": post.title,
+        "content": post.content,
+        "created_at": post.created_at.isoformat(),
+        "updated_at": post.updated_at.isoformat(),
+        "user_id": str(post.user_id),
+        "user_email": post.user.email,
+        "tags": [tag.name for tag in post.tags],
+    }
+
+
+def _ndjson_chunk(posts: list[Post]) -> str:
+    return "".join(json.dumps(_export_row(post)) + "\n" for post in posts)
+
+
+def _csv_chunk(posts: list[Post], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for post in posts:
+        row = _export_row(post)
+        row["tags"] = "|".join(row["tags"])
+        writer.writerow(row[column] for column in CSV_COLUMNS)
+    return buffer.getvalue()
+
+
+async def export_posts(export_format: ExportFormat) -> AsyncIterator[str]:
+    # The stream outlives the request dependencies, so it owns its session.
+    async with async_session() as session:
+        service = PostService(session)
+        if export_format == "csv":
+            yield _csv_chunk([], header=True)
+        async for posts in service.stream_posts():
+            if export_format == "csv":
+                yield _csv_chunk(posts, header=False)
+            else:
+                yield _ndjson_chunk(posts)
@@ -3,33 +3,71 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import Column, ForeignKey, String, Table, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, ForeignKey, Index, String, Table, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db import Base
-from app.core.mixins import SoftDeleteMixin, TimestampMixin
+from app.core.mixins import SoftDeleteMixin, TimestampMixin, VersionMixin
 
 if TYPE_CHECKING:
     from app.auth.models import User
     from app.tags.models import Tag
 
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')"
+)
+
 post_tags = Table(
     "post_tags",
     Base.metadata,
-    Column("post_id", UUID(as_uuid=True), ForeignKey("posts.entity_id")),
-    Column("tag_id", UUID(as_uuid=True), ForeignKey("tags.entity_id")),
+    Column(
+        "post_id", UUID(as_uuid=True), ForeignKey("posts.entity_id"), primary_key=True
+    ),
+    Column(
+        "tag_id", UUID(as_uuid=True), ForeignKey("tags.entity_id"), primary_key=True
+    ),
+    Index("ix_post_tags_tag_id_post_id", "tag_id", "post_id"),
 )
 
 
-class Post(Base, TimestampMixin, SoftDeleteMixin):
+class Post(Base, TimestampMixin, SoftDeleteMixin, VersionMixin):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Live-row partial indexes: soft-deleted rows are filtered out of
+        # every ORM read, so they only cost space in ix_posts_updated_at.
+        Index(
+            "ix_posts_created_at_entity_id",
+            "created_at",
+            "entity_id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index("ix_posts_updated_at", "updated_at"),
+        Index(
+            "ix_posts_deleted_at",
+            "deleted_at",
+            postgresql_where=text("is_deleted = true"),
+        ),
+        Index(
+            "ix_posts_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
 
     entity_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
     user_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.entity_id"), nullable=False
     )
@@ -1,27 +1,146 @@
-from collections.abc import AsyncGenerator
-from typing import Annotated
+import json
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.auth.dependencies import get_current_user
 from app.auth.models import User
-from app.core.db import async_session
-from app.core.exceptions import PermissionDeniedError
-from app.core.schemas import PaginatedResponse
+from app.core.cache import CachedResponse
+from app.core.conditional import (
+    header_last_modified,
+    if_match_versions,
+    is_not_modified,
+    make_etag,
+    make_versioned_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.core.db import get_session, statement_budget
+from app.core.exceptions import BadRequestError
+from app.core.pagination import SortOrder, encode_rank_cursor, next_cursor
+from app.core.responses import ModelResponse
+from app.core.schemas import BulkChangeResponse, BulkIds, PaginatedResponse
+from app.core.settings import settings
+from app.posts.cache import invalidate_posts, listing_key, post_cache, post_key
+from app.posts.export import EXPORT_MEDIA_TYPES, ExportFormat, export_posts
 from app.posts.models import Post
-from app.posts.schemas import CreatePost, PostResponse, UpdatePost
+from app.posts.schemas import (
+    POST_EXPANDABLE,
+    POST_FIELDS,
+    BulkCreateResponse,
+    BulkItemResult,
+    CreatePost,
+    PostExpand,
+    PostField,
+    PostPartialResponse,
+    PostResponse,
+    PostSearchHit,
+    PostTagsChange,
+    PostTagsChangeResponse,
+    TagMatch,
+    UpdatePost,
+)
 from app.posts.services import PostService
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+# Post INSERT ... RETURNING, row counter upsert, post_tags INSERT with the tag
+# counter upsert in one statement, listing change counter upsert, plus one tag
+# catalog read when its snapshot is stale or misses a tag.
+CREATE_POST_STATEMENT_BUDGET = 5
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
-        yield session
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+FIELDS_DESCRIPTION = (
+    "Columns to return; entity_id is always included. Without `expand`, "
+    "no relationships are loaded."
+)
+EXPAND_DESCRIPTION = (
+    "Relationships to embed. Defaults to all of them unless `fields` is given."
+)
+
+FieldsQuery = Annotated[list[PostField] | None, Query(description=FIELDS_DESCRIPTION)]
+ExpandQuery = Annotated[list[PostExpand] | None, Query(description=EXPAND_DESCRIPTION)]
+
+
+async def _read_bulk_items(request: Request) -> list[CreatePost | ValidationError]:
+    items: list[CreatePost | ValidationError] = []
+
+    def add(parse, raw: Any) -> None:
+        if len(items) >= settings.POST_BULK_MAX_ITEMS:
+            raise BadRequestError(
+                f"At most {settings.POST_BULK_MAX_ITEMS} posts per request"
+            )
+        try:
+            items.append(parse(raw))
+        except ValidationError as exc:
+            items.append(exc)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    add(CreatePost.model_validate_json, line)
+        if buffer.strip():
+            add(CreatePost.model_validate_json, buffer)
+        return items
+
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        raise BadRequestError("Request body is not valid JSON") from None
+    if not isinstance(payload, list):
+        raise BadRequestError("Request body must be a JSON array of posts")
+    for raw in payload:
+        add(CreatePost.model_validate, raw)
+    return items
+
+
+def _validation_messages(exc: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(loc) for loc in error['loc']) or 'body'}: {error['msg']}"
+        for error in exc.errors(include_url=False)
+    ]
+
+
+def _resolve_fieldset(
+    fields: list[PostField] | None, expand: list[PostExpand] | None
+) -> tuple[tuple[PostField, ...] | None, tuple[PostExpand, ...]]:
+    if expand is None:
+        expand = [] if fields else list(POST_EXPANDABLE)
+    return (
+        tuple(dict.fromkeys(fields)) if fields else None,
+        tuple(dict.fromkeys(expand)),
+    )
+
+
+def _post_model(
+    post: Post,
+    sparse: bool,
+    fields: tuple[PostField, ...] | None,
+    expand: tuple[PostExpand, ...],
+) -> PostResponse | PostPartialResponse:
+    if not sparse:
+        return PostResponse.model_validate(post)
+    data = {"entity_id": post.entity_id}
+    data.update({field: getattr(post, field) for field in fields or POST_FIELDS})
+    data.update({relationship: getattr(post, relationship) for relationship in expand})
+    return PostPartialResponse.model_validate(data)
+
+
+def _cached_response(request: Request, entry: CachedResponse) -> Response:
+    last_modified = header_last_modified(entry.headers)
+    if is_not_modified(request, entry.headers["ETag"], last_modified):
+        return not_modified_response(entry.headers)
+    return Response(entry.body, media_type="application/json", headers=entry.headers)
 
 
 @router.post("", response_model=PostResponse, status_code=201)
@@ -29,66 +148,352 @@ async def create_post(
     post_data: CreatePost,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> PostResponse:
+) -> ModelResponse:
+    service = PostService(session)
+    with statement_budget(CREATE_POST_STATEMENT_BUDGET, "create_post"):
+        post = await service.create_post(post_data, current_user)
+    await invalidate_posts()
+    return ModelResponse(PostResponse.model_validate(post), status_code=201)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse,
+    status_code=200,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": CreatePost.model_json_schema(),
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "description": "One post per line"}
+                },
+            },
+        }
+    },
+)
+async def bulk_create_posts(
+    request: Request,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    items = await _read_bulk_items(request)
+    service = PostService(session)
+    live_tags = await service.get_live_tag_ids(
+        tag_id for item in items if isinstance(item, CreatePost) for tag_id in item.tags
+    )
+
+    results: list[BulkItemResult | None] = [None] * len(items)
+    to_create: list[tuple[int, CreatePost]] = []
+    for index, item in enumerate(items):
+        if isinstance(item, ValidationError):
+            results[index] = BulkItemResult(
+                index=index, status="invalid", errors=_validation_messages(item)
+            )
+            continue
+        missing = [tag_id for tag_id in item.tags if tag_id not in live_tags]
+        if missing:
+            results[index] = BulkItemResult(
+                index=index,
+                status="invalid",
+                errors=[f"tags: unknown tag {tag_id}" for tag_id in missing],
+            )
+            continue
+        to_create.append((index, item))
+
+    entity_ids = await service.bulk_create_posts(
+        [item for _, item in to_create], current_user.entity_id
+    )
+    if entity_ids:
+        await invalidate_posts()
+    for (index, _), entity_id in zip(to_create, entity_ids, strict=True):
+        results[index] = BulkItemResult(
+            index=index, status="created", entity_id=entity_id
+        )
+
+    return ModelResponse(
+        BulkCreateResponse(
+            created=len(entity_ids),
+            failed=len(items) - len(entity_ids),
+            items=results,
+        )
+    )
+
+
+async def _change_post_tags(
+    change: PostTagsChange, user_id: UUID, session: AsyncSession, attach: bool
+) -> ModelResponse:
+    post_ids = list(dict.fromkeys(change.post_ids))
+    tag_ids = list(dict.fromkeys(change.tag_ids))
+    if len(post_ids) > settings.POST_TAGS_BULK_MAX_POSTS:
+        raise BadRequestError(
+            f"At most {settings.POST_TAGS_BULK_MAX_POSTS} posts per request"
+        )
+
+    service = PostService(session)
+    not_found, forbidden = await service.classify_ownership(Post, post_ids, user_id)
+    unknown_tags = []
+    if attach:
+        live_tags = await service.get_live_tag_ids(tag_ids)
+        unknown_tags = [tag_id for tag_id in tag_ids if tag_id not in live_tags]
+        affected, touched = await service.attach_tags(post_ids, tag_ids, user_id)
+    else:
+        affected, touched = await service.detach_tags(post_ids, tag_ids, user_id)
+    await invalidate_posts(*touched)
+    return ModelResponse(
+        PostTagsChangeResponse(
+            affected=affected,
+            posts_updated=len(touched),
+            not_found=not_found,
+            forbidden=forbidden,
+            unknown_tags=unknown_tags,
+        )
+    )
+
+
+@router.post("/tags:attach", response_model=PostTagsChangeResponse, status_code=200)
+async def attach_tags(
+    change: PostTagsChange,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    return await _change_post_tags(change, current_user.entity_id, session, attach=True)
+
+
+@router.post("/tags:detach", response_model=PostTagsChangeResponse, status_code=200)
+async def detach_tags(
+    change: PostTagsChange,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    return await _change_post_tags(
+        change, current_user.entity_id, session, attach=False
+    )
+
+
+async def _set_posts_deleted(
+    body: BulkIds, user_id: UUID, session: AsyncSession, deleted: bool
+) -> ModelResponse:
+    post_ids = list(dict.fromkeys(body.ids))
+    if len(post_ids) > settings.BULK_DELETE_MAX_IDS:
+        raise BadRequestError(f"At most {settings.BULK_DELETE_MAX_IDS} ids per request")
+
     service = PostService(session)
-    post = await service.create_post(post_data, current_user.entity_id)
-    stmt = (
-        select(Post)
-        .options(selectinload(Post.user), selectinload(Post.tags))
-        .where(Post.entity_id == post.entity_id)
+    affected, not_found, forbidden = await service.set_posts_deleted(
+        post_ids, user_id, deleted
+    )
+    if affected:
+        await invalidate_posts(*affected)
+    return ModelResponse(
+        BulkChangeResponse(affected=affected, not_found=not_found, forbidden=forbidden)
+    )
+
+
+@router.delete("", response_model=BulkChangeResponse, status_code=200)
+async def bulk_delete_posts(
+    body: BulkIds,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    return await _set_posts_deleted(body, current_user.entity_id, session, deleted=True)
+
+
+@router.post("/restore", response_model=BulkChangeResponse, status_code=200)
+async def bulk_restore_posts(
+    body: BulkIds,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    return await _set_posts_deleted(
+        body, current_user.entity_id, session, deleted=False
     )
-    result = await session.execute(stmt)
-    post = result.scalar_one()
-    return PostResponse.model_validate(post)
 
 
-@router.get("", response_model=PaginatedResponse[PostResponse], status_code=200)
+@router.get(
+    "",
+    response_model=PaginatedResponse[PostResponse]
+    | PaginatedResponse[PostPartialResponse],
+    status_code=200,
+)
 async def list_posts(
+    request: Request,
     session: Annotated[AsyncSession, Depends(get_session)],
     page: Annotated[int, Query(ge=1)] = 1,
     size: Annotated[int, Query(ge=1, le=100)] = 10,
     only_deleted: Annotated[bool, Query()] = False,
-) -> PaginatedResponse[PostResponse]:
+    cursor: Annotated[str | None, Query()] = None,
+    order: Annotated[SortOrder, Query()] = "desc",
+    include_total: Annotated[bool, Query()] = True,
+    tags: Annotated[list[UUID] | None, Query()] = None,
+    match: Annotated[TagMatch, Query()] = "any",
+    fields: FieldsQuery = None,
+    expand: ExpandQuery = None,
+) -> Response:
     service = PostService(session)
-    posts, total = await service.list_posts(page, size, only_deleted)
-    return PaginatedResponse(
-        items=[PostResponse.model_validate(post) for post in posts], total=total
+    sparse = fields is not None or expand is not None
+    fields, expand = _resolve_fieldset(fields, expand)
+
+    async def load_validators() -> dict[str, str]:
+        changes, last_modified = await service.get_listing_validators()
+        return validator_headers(
+            make_etag(
+                request.url.query,
+                changes,
+                last_modified and last_modified.isoformat(),
+            ),
+            last_modified,
+        )
+
+    async def load_page() -> PaginatedResponse:
+        posts, total = await service.list_posts(
+            page,
+            size,
+            only_deleted,
+            cursor,
+            order,
+            include_total,
+            tags,
+            match,
+            fields,
+            expand,
+        )
+        return PaginatedResponse(
+            items=[_post_model(post, sparse, fields, expand) for post in posts],
+            total=total,
+            next_cursor=next_cursor(posts, size),
+        )
+
+    if cursor is None and page <= settings.RESPONSE_CACHE_MAX_PAGES:
+
+        async def load() -> CachedResponse:
+            headers = await load_validators()
+            body = ModelResponse(await load_page(), exclude_unset=sparse).body
+            return CachedResponse(body=body, headers=headers)
+
+        entry = await post_cache.get_or_load(
+            await listing_key(request.query_params), load
+        )
+        return _cached_response(request, entry)
+
+    headers = await load_validators()
+    if is_not_modified(request, headers["ETag"], header_last_modified(headers)):
+        return not_modified_response(headers)
+    return ModelResponse(await load_page(), exclude_unset=sparse, headers=headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}
+    },
+)
+async def export_all_posts(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_posts(export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="posts.{export_format}"'
+        },
     )
 
 
-@router.get("/{entity_id}", response_model=PostResponse, status_code=200)
+@router.get("/search", response_model=PaginatedResponse[PostSearchHit], status_code=200)
+async def search_posts(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    q: Annotated[str, Query(min_length=1, max_length=256)],
+    size: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: Annotated[str | None, Query()] = None,
+) -> ModelResponse:
+    service = PostService(session)
+    hits = await service.search_posts(q, size, cursor)
+    items = [
+        PostSearchHit(
+            post=PostResponse.model_validate(post),
+            rank=rank,
+            title_highlight=title_highlight,
+            content_highlight=content_highlight,
+        )
+        for post, rank, title_highlight, content_highlight in hits
+    ]
+    last_cursor = None
+    if len(hits) == size:
+        last_post, last_rank, *_ = hits[-1]
+        last_cursor = encode_rank_cursor(last_rank, last_post.entity_id)
+    return ModelResponse(PaginatedResponse(items=items, next_cursor=last_cursor))
+
+
+@router.get(
+    "/{entity_id}",
+    response_model=PostResponse | PostPartialResponse,
+    status_code=200,
+)
 async def get_post(
     entity_id: UUID,
+    request: Request,
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> PostResponse:
+    fields: FieldsQuery = None,
+    expand: ExpandQuery = None,
+) -> Response:
     service = PostService(session)
-    post = await service.get_post(entity_id)
-    return PostResponse.model_validate(post)
+    sparse = fields is not None or expand is not None
+    fields, expand = _resolve_fieldset(fields, expand)
+
+    async def load() -> CachedResponse:
+        version, last_modified = await service.get_post_validators(entity_id)
+        post = await service.get_post(entity_id, fields, expand)
+        model = _post_model(post, sparse, fields, expand)
+        etag = make_versioned_etag(
+            version, entity_id, last_modified.isoformat(), fields, expand
+        )
+        return CachedResponse(
+            body=ModelResponse(model, exclude_unset=sparse).body,
+            headers=validator_headers(etag, last_modified),
+        )
+
+    # Only the full representation is cached, so invalidation stays one key
+    # per post. Fresh hits never touch the database; a conditional request
+    # that misses loads the full post so the next one is answered from cache.
+    if sparse:
+        entry = await load()
+    else:
+        entry = await post_cache.get_or_load(post_key(entity_id), load)
+    return _cached_response(request, entry)
 
 
 @router.put("/{entity_id}", response_model=PostResponse, status_code=200)
 async def update_post(
     entity_id: UUID,
     update_data: UpdatePost,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> PostResponse:
+) -> ModelResponse:
     service = PostService(session)
-    post = await service.get_post(entity_id)
-    if post.user_id != current_user.entity_id:
-        raise PermissionDeniedError("Not authorized")
-    post = await service.update_post(entity_id, update_data)
-    return PostResponse.model_validate(post)
+    post = await service.update_post(
+        entity_id, update_data, current_user.entity_id, if_match_versions(request)
+    )
+    await invalidate_posts(entity_id)
+    return ModelResponse(PostResponse.model_validate(post))
 
 
 @router.delete("/{entity_id}", status_code=204)
 async def delete_post(
     entity_id: UUID,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
 ) -> None:
     service = PostService(session)
-    post = await service.get_post(entity_id)
-    if post.user_id != current_user.entity_id:
-        raise PermissionDeniedError("Not authorized")
-    await service.delete_post(entity_id)
+    await service.delete_post(
+        entity_id, current_user.entity_id, if_match_versions(request)
+    )
+    await invalidate_posts(entity_id)
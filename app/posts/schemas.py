@@ -1,10 +1,27 @@
+from datetime import datetime
+from typing import Literal, get_args
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.auth.schemas import UserResponse
 from app.core.schemas import SoftDeleteSchema, TimestampSchema
-from app.tags.schemas import TagResponse
+from app.tags.schemas import TagSummary
+
+TagMatch = Literal["any", "all"]
+PostField = Literal[
+    "title",
+    "content",
+    "version",
+    "created_at",
+    "updated_at",
+    "is_deleted",
+    "deleted_at",
+]
+PostExpand = Literal["user", "tags"]
+
+POST_FIELDS: tuple[PostField, ...] = get_args(PostField)
+POST_EXPANDABLE: tuple[PostExpand, ...] = get_args(PostExpand)
 
 
 class CreatePost(BaseModel):
@@ -23,7 +40,56 @@ class PostResponse(TimestampSchema, SoftDeleteSchema):
     entity_id: UUID
     title: str
     content: str
+    version: int
     user: UserResponse
-    tags: list[TagResponse] = []
+    tags: list[TagSummary] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class PostPartialResponse(BaseModel):
+    # Sparse fieldset representation: only the attributes that were set are
+    # serialized (exclude_unset), entity_id is always present.
+    entity_id: UUID
+    title: str | None = None
+    content: str | None = None
+    version: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    is_deleted: bool | None = None
+    deleted_at: datetime | None = None
+    user: UserResponse | None = None
+    tags: list[TagSummary] | None = None
+
+
+class PostTagsChange(BaseModel):
+    post_ids: list[UUID] = Field(min_length=1)
+    tag_ids: list[UUID] = Field(min_length=1, max_length=100)
+
+
+class PostTagsChangeResponse(BaseModel):
+    affected: int
+    posts_updated: int
+    not_found: list[UUID] = []
+    forbidden: list[UUID] = []
+    unknown_tags: list[UUID] = []
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: Literal["created", "invalid"]
+    entity_id: UUID | None = None
+    errors: list[str] = []
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    items: list[BulkItemResult]
+
+
+class PostSearchHit(BaseModel):
+    post: PostResponse
+    rank: float
+    title_highlight: str
+    content_highlight: str
@@ -1,96 +1,495 @@
-from uuid import UUID
+from collections.abc import AsyncIterator, Collection, Iterable
+from datetime import datetime
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    CTE,
+    ColumnElement,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.auth.models import User
-from app.core.mixins import CRUDMixin
-from app.posts.models import Post
-from app.posts.schemas import CreatePost, UpdatePost
+from app.core.counters import (
+    TagPostCount,
+    adjust_row_count,
+    bump_change_count,
+    get_change_count,
+    tag_post_count_upsert,
+)
+from app.core.exceptions import ResourceNotFoundError
+from app.core.mixins import (
+    INCLUDE_DELETED,
+    CRUDMixin,
+    deleted_rows,
+    id_array,
+    uuid_array,
+)
+from app.core.pagination import SortOrder, decode_rank_cursor, paginate
+from app.posts.models import SEARCH_CONFIG, Post, post_tags
+from app.posts.schemas import (
+    POST_EXPANDABLE,
+    CreatePost,
+    PostExpand,
+    PostField,
+    TagMatch,
+    UpdatePost,
+)
+from app.tags.catalog import tag_catalog
 from app.tags.models import Tag
 
+BULK_INSERT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 500
+TITLE_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+CONTENT_HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=35, MinWords=15"
+)
+
 
 class PostService(CRUDMixin):
     def __init__(self, session: AsyncSession):
         super().__init__(session)
 
-    async def create_post(self, post_data: CreatePost, user_id: UUID) -> Post:
-        # Get current user
+    async def create_post(self, post_data: CreatePost, user: User) -> Post:
+        # One transaction: INSERT ... RETURNING, the row counter, and the
+        # post_tags rows with their tag counters. The response's tags come
+        # from the in-process catalog and the authenticated user is reused,
+        # so neither is selected again.
         result = await self.session.execute(
-            select(User).where(User.entity_id == user_id)
+            insert(Post)
+            .values(**post_data.model_dump(exclude={"tags"}), user_id=user.entity_id)
+            .returning(Post)
         )
-        current_user = result.scalar_one()
-
-        post = Post(**post_data.model_dump(exclude={"tags"}), user_id=user_id)
-        post = await self.create(post)
+        post = result.scalar_one()
+        await adjust_row_count(self.session, Post.__tablename__, live=1)
+        tags = []
         if post_data.tags:
-            result = await self.session.execute(
-                select(Tag)
-                .where(Tag.entity_id.in_(post_data.tags))
-                .where(Tag.is_deleted == False)  # noqa: E712
+            linked = await self._link_live_tags(
+                [(post.entity_id, tag_id) for tag_id in dict.fromkeys(post_data.tags)]
             )
-            post.tags = result.scalars().all()
-        await self.session.commit()
-        await self.session.refresh(post)
+            tags = [
+                tag.to_model()
+                for tag in (await tag_catalog.resolve(self.session, linked)).values()
+            ]
+        await self._commit_listing_change()
 
-        post.user = current_user
+        set_committed_value(post, "user", user)
+        set_committed_value(post, "tags", tags)
         return post
 
-    async def get_post(self, entity_id: UUID) -> Post:
+    async def get_live_tag_ids(self, tag_ids: Iterable[UUID]) -> set[UUID]:
+        return set(await tag_catalog.resolve(self.session, tag_ids))
+
+    async def _link_live_tags(self, links: list[tuple[UUID, UUID]]) -> list[UUID]:
+        # The catalog may still hold a tag another worker just deleted, so
+        # links are written with INSERT ... SELECT against live tags, and the
+        # tag counters are bumped from its RETURNING rows in the same
+        # statement. Both id columns travel as one array each. Returns the
+        # linked tag ids.
+        requested = (
+            func.unnest(
+                uuid_array("link_post_ids", [post_id for post_id, _ in links]),
+                uuid_array("link_tag_ids", [tag_id for _, tag_id in links]),
+            )
+            .table_valued(column("post_id"), column("tag_id"))
+            .render_derived(name="requested")
+        )
+        tags = Tag.__table__
+        linked = (
+            insert(post_tags)
+            .from_select(
+                ["post_id", "tag_id"],
+                select(requested.c.post_id, tags.c.entity_id)
+                .join_from(requested, tags, tags.c.entity_id == requested.c.tag_id)
+                .where(tags.c.is_deleted == False),  # noqa: E712
+            )
+            .returning(post_tags.c.tag_id)
+            .cte("linked")
+        )
+        counted = (
+            tag_post_count_upsert((select(linked.c.tag_id), 1))
+            .returning(TagPostCount.tag_id)
+            .cte("counted")
+        )
+        result = await self.session.execute(
+            select(
+                linked.c.tag_id,
+                select(func.count()).select_from(counted).scalar_subquery(),
+            )
+        )
+        return [row[0] for row in result]
+
+    async def bulk_create_posts(
+        self, posts_data: list[CreatePost], user_id: UUID
+    ) -> list[UUID]:
+        # Ids are generated client-side so post_tags rows can be built without
+        # reading anything back; both tables are written with multi-row
+        # INSERTs in a single transaction.
+        post_rows = []
+        link_rows = []
+        for post_data in posts_data:
+            entity_id = uuid4()
+            post_rows.append(
+                {
+                    "entity_id": entity_id,
+                    "title": post_data.title,
+                    "content": post_data.content,
+                    "user_id": user_id,
+                }
+            )
+            link_rows.extend(
+                (entity_id, tag_id) for tag_id in dict.fromkeys(post_data.tags)
+            )
+
+        for start in range(0, len(post_rows), BULK_INSERT_CHUNK_SIZE):
+            chunk = post_rows[start : start + BULK_INSERT_CHUNK_SIZE]
+            await self.session.execute(insert(Post).values(chunk))
+        await adjust_row_count(self.session, Post.__tablename__, live=len(post_rows))
+        if link_rows:
+            await self._link_live_tags(link_rows)
+        await self._commit_listing_change()
+        return [row["entity_id"] for row in post_rows]
+
+    @staticmethod
+    def _load_options(
+        fields: Collection[PostField] | None, expand: Collection[PostExpand]
+    ) -> list:
+        # Unrequested columns are left out of the SELECT and unrequested
+        # relationships are never queried.
+        options = []
+        if fields is not None:
+            columns = {"entity_id", "created_at", *fields}
+            if "user" in expand:
+                columns.add("user_id")
+            options.append(load_only(*(getattr(Post, column) for column in columns)))
+        for relationship in POST_EXPANDABLE:
+            attribute = getattr(Post, relationship)
+            if relationship in expand:
+                options.append(selectinload(attribute))
+            else:
+                options.append(noload(attribute))
+        return options
+
+    async def get_post(
+        self,
+        entity_id: UUID,
+        fields: Collection[PostField] | None = None,
+        expand: Collection[PostExpand] = POST_EXPANDABLE,
+    ) -> Post:
         stmt = (
             select(Post)
-            .options(selectinload(Post.tags), selectinload(Post.user))
+            .options(*self._load_options(fields, expand))
             .where(Post.entity_id == entity_id)
         )
         result = await self.session.execute(stmt)
         post = result.scalar_one_or_none()
-        if not post or post.is_deleted:
-            from app.core.exceptions import ResourceNotFoundError
-
+        if post is None:
             raise ResourceNotFoundError("Resource not found")
-        post.tags = [tag for tag in post.tags if not tag.is_deleted]
         return post
 
-    async def update_post(self, entity_id: UUID, update_data: UpdatePost) -> Post:
-        post = await self.get_post(entity_id)
-        update_dict = update_data.model_dump(exclude_unset=True, exclude={"tags"})
-        post = await self.update(post, update_dict)
+    async def get_post_validators(self, entity_id: UUID) -> tuple[int, datetime]:
+        # Narrow validator query: the post's version, and its own timestamp or
+        # that of any tag it carries (deleted tags included, since deleting
+        # one changes the representation).
+        stmt = (
+            select(
+                Post.version,
+                func.greatest(Post.updated_at, func.max(Tag.updated_at)),
+            )
+            .select_from(Post)
+            .outerjoin(post_tags, post_tags.c.post_id == Post.entity_id)
+            .outerjoin(Tag, Tag.entity_id == post_tags.c.tag_id)
+            .where(Post.entity_id == entity_id)
+            .group_by(Post.entity_id)
+            .execution_options(**{INCLUDE_DELETED: (Tag,)})
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        if row is None:
+            raise ResourceNotFoundError("Resource not found")
+        return row.version, row[1]
+
+    async def get_listing_validators(self) -> tuple[int, datetime | None]:
+        # (changes, last modified): every post or tag write that can alter a
+        # listing bumps the count in its own transaction.
+        return await get_change_count(self.session, Post.__tablename__)
+
+    async def _commit_listing_change(self) -> None:
+        await bump_change_count(self.session, Post.__tablename__)
+        await self.session.commit()
+
+    async def update_post(
+        self,
+        entity_id: UUID,
+        update_data: UpdatePost,
+        user_id: UUID,
+        expected_versions: list[int] | None = None,
+    ) -> Post:
+        # Fields, version and the tag set change in one conditional
+        # statement; the post is read back afterwards for the response.
+        values = update_data.model_dump(exclude_unset=True, exclude={"tags"})
+        related = []
         if update_data.tags is not None:
-            result = await self.session.execute(
-                select(Tag)
-                .where(Tag.entity_id.in_(update_data.tags))
-                .where(Tag.is_deleted == False)  # noqa: E712
+            tag_ids = list(dict.fromkeys(update_data.tags))
+            related = [lambda updated: self._sync_tags(updated, tag_ids)]
+        await self.update_owned(
+            Post, entity_id, user_id, values, expected_versions, related
+        )
+        await self._commit_listing_change()
+        return await self.get_post(entity_id)
+
+    @classmethod
+    def _sync_tags(cls, updated: CTE, tag_ids: list[UUID]) -> CTE:
+        # The counter upsert reads both link CTEs, so all three run in the
+        # update's statement.
+        unlinked = cls._unlink_other_tags(updated, tag_ids)
+        linked = cls._link_tags(updated, tag_ids)
+        return (
+            tag_post_count_upsert(
+                (select(unlinked.c.tag_id), -1), (select(linked.c.tag_id), 1)
+            )
+            .returning(TagPostCount.tag_id)
+            .cte("counted")
+        )
+
+    @staticmethod
+    def _unlink_other_tags(updated: CTE, tag_ids: list[UUID]) -> CTE:
+        return (
+            delete(post_tags)
+            .where(post_tags.c.post_id == updated.c.entity_id)
+            .where(~(post_tags.c.tag_id == id_array("keep_tag_ids", tag_ids)))
+            .returning(post_tags.c.post_id, post_tags.c.tag_id)
+            .cte("unlinked")
+        )
+
+    @staticmethod
+    def _link_tags(updated: CTE, tag_ids: list[UUID]) -> CTE:
+        tags = Tag.__table__
+        return (
+            pg_insert(post_tags)
+            .from_select(
+                ["post_id", "tag_id"],
+                select(updated.c.entity_id, tags.c.entity_id)
+                .join_from(updated, tags, true())
+                .where(tags.c.entity_id == id_array("link_tag_ids", tag_ids))
+                .where(tags.c.is_deleted == False),  # noqa: E712
             )
-            post.tags = result.scalars().all()
+            .on_conflict_do_nothing()
+            .returning(post_tags.c.post_id, post_tags.c.tag_id)
+            .cte("linked")
+        )
+
+    async def delete_post(
+        self,
+        entity_id: UUID,
+        user_id: UUID,
+        expected_versions: list[int] | None = None,
+    ) -> None:
+        await self.soft_delete_owned(Post, entity_id, user_id, expected_versions)
+        await self._shift_tag_post_counts([entity_id], -1)
+        await self._commit_listing_change()
+
+    async def set_posts_deleted(
+        self, post_ids: list[UUID], user_id: UUID, deleted: bool
+    ) -> tuple[list[UUID], list[UUID], list[UUID]]:
+        affected, not_found, forbidden = await self.set_deleted_owned(
+            Post, post_ids, user_id, deleted
+        )
+        if affected:
+            await self._shift_tag_post_counts(affected, -1 if deleted else 1)
+            await self._commit_listing_change()
+        else:
             await self.session.commit()
-            await self.session.refresh(post)
-        return post
+        return affected, not_found, forbidden
+
+    async def _shift_tag_post_counts(
+        self, post_ids: Collection[UUID], delta: int
+    ) -> None:
+        # A post leaving or rejoining the live set moves every tag it carries.
+        await self.session.execute(
+            tag_post_count_upsert(
+                (
+                    select(post_tags.c.tag_id).where(
+                        post_tags.c.post_id == id_array("post_ids", post_ids)
+                    ),
+                    delta,
+                )
+            )
+        )
+
+    @staticmethod
+    def _owned_posts(post_ids: Collection[UUID], user_id: UUID) -> CTE:
+        return (
+            select(Post.entity_id)
+            .where(Post.entity_id == id_array("post_ids", post_ids))
+            .where(Post.user_id == user_id)
+            .cte("owned")
+        )
+
+    async def _touch_changed_posts(
+        self, changed: CTE, delta: int
+    ) -> tuple[int, list[UUID]]:
+        # Changed links alter the representation, so the posts they belong to
+        # get a new updated_at (and with it new validators), and the tags'
+        # counters move by ``delta`` per link, in the same statement. Returns
+        # (links changed, posts touched); the caller commits.
+        posts = Post.__table__
+        counted = (
+            tag_post_count_upsert((select(changed.c.tag_id), delta))
+            .returning(TagPostCount.tag_id)
+            .cte("counted")
+        )
+        touched = (
+            update(posts)
+            .where(posts.c.entity_id.in_(select(changed.c.post_id)))
+            .values(updated_at=func.now(), version=posts.c.version + 1)
+            .returning(posts.c.entity_id)
+            .cte("touched")
+        )
+        result = await self.session.execute(
+            select(
+                touched.c.entity_id,
+                select(func.count()).select_from(changed).scalar_subquery(),
+                select(func.count()).select_from(counted).scalar_subquery(),
+            )
+        )
+        rows = result.all()
+        return (rows[0][1] if rows else 0), [row[0] for row in rows]
+
+    async def attach_tags(
+        self, post_ids: Collection[UUID], tag_ids: Collection[UUID], user_id: UUID
+    ) -> tuple[int, list[UUID]]:
+        # INSERT ... SELECT over owned posts x live tags (the soft-delete
+        # criteria reach into the CTEs); existing links are skipped by the
+        # post_tags primary key.
+        owned = self._owned_posts(post_ids, user_id)
+        inserted = (
+            pg_insert(post_tags)
+            .from_select(
+                ["post_id", "tag_id"],
+                select(owned.c.entity_id, Tag.entity_id)
+                .join_from(owned, Tag, true())
+                .where(Tag.entity_id == id_array("tag_ids", tag_ids)),
+            )
+            .on_conflict_do_nothing()
+            .returning(post_tags.c.post_id, post_tags.c.tag_id)
+            .cte("changed")
+        )
+        result = await self._touch_changed_posts(inserted, 1)
+        if result[0]:
+            await self._commit_listing_change()
+        else:
+            await self.session.commit()
+        return result
 
-    async def delete_post(self, entity_id: UUID) -> None:
-        post = await self.get_post(entity_id)
-        await self.delete(post)
+    async def detach_tags(
+        self, post_ids: Collection[UUID], tag_ids: Collection[UUID], user_id: UUID
+    ) -> tuple[int, list[UUID]]:
+        owned = self._owned_posts(post_ids, user_id)
+        deleted = (
+            delete(post_tags)
+            .where(post_tags.c.post_id == owned.c.entity_id)
+            .where(post_tags.c.tag_id == id_array("tag_ids", tag_ids))
+            .returning(post_tags.c.post_id, post_tags.c.tag_id)
+            .cte("changed")
+        )
+        result = await self._touch_changed_posts(deleted, -1)
+        if result[0]:
+            await self._commit_listing_change()
+        else:
+            await self.session.commit()
+        return result
 
     async def list_posts(
-        self, page: int = 1, size: int = 10, only_deleted: bool = False
-    ) -> tuple[list[Post], int]:
-        stmt = select(Post).options(selectinload(Post.tags), selectinload(Post.user))
+        self,
+        page: int = 1,
+        size: int = 10,
+        only_deleted: bool = False,
+        cursor: str | None = None,
+        order: SortOrder = "desc",
+        include_total: bool = True,
+        tag_ids: list[UUID] | None = None,
+        match: TagMatch = "any",
+        fields: Collection[PostField] | None = None,
+        expand: Collection[PostExpand] = POST_EXPANDABLE,
+    ) -> tuple[list[Post], int | None]:
+        filters = [self._tag_filter(tag_ids, match)] if tag_ids else []
+        stmt = select(Post).options(*self._load_options(fields, expand))
         if only_deleted:
-            stmt = stmt.where(Post.is_deleted)
-        else:
-            stmt = stmt.where(Post.is_deleted == False)  # noqa: E712
-        paginated_stmt = stmt.offset((page - 1) * size).limit(size)
+            stmt = deleted_rows(stmt, Post)
+        stmt = stmt.where(*filters)
+        paginated_stmt = paginate(stmt, Post, page, size, cursor, order)
         result = await self.session.execute(paginated_stmt)
         posts = result.scalars().all()
-        for post in posts:
-            post.tags = [tag for tag in post.tags if not tag.is_deleted]
-
-        count_stmt = select(func.count(Post.entity_id))
-        if only_deleted:
-            count_stmt = count_stmt.where(Post.is_deleted)
-        else:
-            count_stmt = count_stmt.where(Post.is_deleted == False)  # noqa: E712
-        count_result = await self.session.execute(count_stmt)
-        total = count_result.scalar()
 
+        total = await self.count(Post, only_deleted, filters) if include_total else None
         return posts, total
+
+    @staticmethod
+    def _tag_filter(tag_ids: list[UUID], match: TagMatch) -> ColumnElement[bool]:
+        # Both forms are answered from the (tag_id, post_id) index on post_tags.
+        tag_ids = list(dict.fromkeys(tag_ids))
+        if match == "all":
+            return Post.entity_id.in_(
+                select(post_tags.c.post_id)
+                .where(post_tags.c.tag_id.in_(tag_ids))
+                .group_by(post_tags.c.post_id)
+                .having(func.count() == len(tag_ids))
+            )
+        return exists().where(
+            post_tags.c.post_id == Post.entity_id, post_tags.c.tag_id.in_(tag_ids)
+        )
+
+    async def stream_posts(self) -> AsyncIterator[list[Post]]:
+        # Server-side cursor: rows arrive EXPORT_CHUNK_SIZE at a time and the
+        # selectin loaders fetch users and tags once per chunk, so memory
+        # stays flat regardless of table size.
+        stmt = (
+            select(Post)
+            .options(selectinload(Post.tags), selectinload(Post.user))
+            .order_by(Post.created_at, Post.entity_id)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        result = await self.session.stream_scalars(stmt)
+        async for posts in result.partitions():
+            yield posts
+
+    async def search_posts(
+        self, query: str, size: int = 10, cursor: str | None = None
+    ) -> list[tuple[Post, float, str, str]]:
+        config = cast(SEARCH_CONFIG, REGCONFIG)
+        ts_query = func.websearch_to_tsquery(config, query)
+        rank = func.ts_rank_cd(Post.search_vector, ts_query)
+        stmt = (
+            select(
+                Post,
+                rank.label("rank"),
+                func.ts_headline(config, Post.title, ts_query, TITLE_HEADLINE_OPTIONS),
+                func.ts_headline(
+                    config, Post.content, ts_query, CONTENT_HEADLINE_OPTIONS
+                ),
+            )
+            .options(selectinload(Post.tags), selectinload(Post.user))
+            .where(Post.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), Post.entity_id.desc())
+            .limit(size)
+        )
+        if cursor is not None:
+            last_rank, last_id = decode_rank_cursor(cursor)
+            stmt = stmt.where(tuple_(rank, Post.entity_id) < tuple_(last_rank, last_id))
+
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
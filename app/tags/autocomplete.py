@@ -0,0 +1,48 @@
+from bisect import bisect_left
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.tags.catalog import TagCatalog, TagSnapshot, tag_catalog
+
+
+class TagNameIndex:
+    # Live tag names sorted by their lowercased form, so a prefix is a bisect
+    # plus a short forward scan. Built from the tag catalog and rebuilt
+    # whenever the catalog's snapshot version moves.
+    def __init__(self, catalog: TagCatalog):
+        self.catalog = catalog
+        self._version: int | None = None
+        self._keys: list[str] = []
+        self._entries: list[tuple[UUID, str]] = []
+
+    async def search(
+        self, session: AsyncSession, prefix: str, limit: int
+    ) -> list[tuple[UUID, str]]:
+        snapshot = await self.catalog.snapshot(session)
+        if snapshot.version != self._version:
+            self._build(snapshot)
+        prefix = prefix.lower()
+        start = bisect_left(self._keys, prefix)
+        matches = []
+        for key, entry in zip(
+            self._keys[start : start + limit],
+            self._entries[start : start + limit],
+            strict=True,
+        ):
+            if not key.startswith(prefix):
+                break
+            matches.append(entry)
+        return matches
+
+    def _build(self, snapshot: TagSnapshot) -> None:
+        rows = sorted(
+            (tag.name.lower(), tag.entity_id, tag.name)
+            for tag in snapshot.tags.values()
+        )
+        self._keys = [key for key, _, _ in rows]
+        self._entries = [(entity_id, name) for _, entity_id, name in rows]
+        self._version = snapshot.version
+
+
+tag_name_index = TagNameIndex(tag_catalog)
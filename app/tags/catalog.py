@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.tags.models import Tag
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "tag_catalog"
+LISTEN_MAX_BACKOFF_SECONDS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogTag:
+    entity_id: UUID
+    name: str
+    user_id: UUID
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    def to_model(self) -> Tag:
+        # Entries are shared by every request, so each caller gets its own
+        # transient instance rather than one attached to some session.
+        return Tag(
+            entity_id=self.entity_id,
+            name=self.name,
+            user_id=self.user_id,
+            version=self.version,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            is_deleted=False,
+            deleted_at=None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TagSnapshot:
+    version: int
+    tags: dict[UUID, CatalogTag]
+
+
+class TagCatalog:
+    # Immutable snapshots of every live tag, swapped whole on reload and
+    # numbered so derived structures know when to rebuild. A tag write marks
+    # the snapshot stale here and, through NOTIFY, in every other worker; the
+    # next lookup reloads it. ``ttl`` bounds staleness if a notification is
+    # ever lost.
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot = TagSnapshot(version=0, tags={})
+        self._loaded_at: float | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.reloads = 0
+        self.db_lookups = 0
+        self.notifications = 0
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._loaded_at = None
+
+    async def snapshot(self, session: AsyncSession) -> TagSnapshot:
+        snapshot, _ = await self._current(session)
+        return snapshot
+
+    async def resolve(
+        self, session: AsyncSession, tag_ids: Iterable[UUID]
+    ) -> dict[UUID, CatalogTag]:
+        # Returns the live tags among ``tag_ids``, in request order. Ids an
+        # older snapshot does not know may belong to a tag created by another
+        # worker whose notification is still in flight, so those are looked
+        # up before being reported as unknown.
+        tag_ids = list(dict.fromkeys(tag_ids))
+        if not tag_ids:
+            return {}
+        snapshot, reloaded = await self._current(session)
+        found = {
+            tag_id: snapshot.tags[tag_id]
+            for tag_id in tag_ids
+            if tag_id in snapshot.tags
+        }
+        missing = [tag_id for tag_id in tag_ids if tag_id not in found]
+        if missing and not reloaded:
+            self.db_lookups += 1
+            result = await session.execute(
+                select(*_columns()).where(Tag.entity_id.in_(missing))
+            )
+            fetched = {row.entity_id: CatalogTag(**row._mapping) for row in result}
+            if fetched:
+                self.invalidate()
+                found.update(fetched)
+        return {tag_id: found[tag_id] for tag_id in tag_ids if tag_id in found}
+
+    async def publish_change(self, session: AsyncSession) -> None:
+        # NOTIFY is transactional: other workers hear about the change only if
+        # the caller's transaction commits.
+        await session.execute(select(func.pg_notify(CHANNEL, "")))
+
+    async def listen(self) -> None:
+        # Runs for the life of the app on its own connection, outside the
+        # pool. Notifications sent while disconnected are lost, so every
+        # (re)connect starts from a fresh snapshot.
+        dsn = (
+            make_url(settings.DATABASE_URL)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        backoff = 1.0
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception:
+                logger.warning("Tag catalog listener cannot connect, retrying")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, LISTEN_MAX_BACKOFF_SECONDS)
+                continue
+
+            try:
+                await self._listen_on(connection)
+                logger.warning("Tag catalog listener disconnected, reconnecting")
+                backoff = 1.0
+                continue
+            except Exception:
+                # A failed LISTEN must not end the task: without it every
+                # worker would serve tags up to ``ttl`` seconds stale.
+                logger.exception("Tag catalog listener failed, retrying")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, LISTEN_MAX_BACKOFF_SECONDS)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "version": self._snapshot.version,
+            "tags": len(self._snapshot.tags),
+            "fresh": self._is_fresh(),
+            "reloads": self.reloads,
+            "db_lookups": self.db_lookups,
+            "notifications": self.notifications,
+        }
+
+    async def _listen_on(self, connection: asyncpg.Connection) -> None:
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _connection: closed.set())
+        await connection.add_listener(CHANNEL, self._on_notification)
+        self.invalidate()
+        await closed.wait()
+
+    def _on_notification(self, *_args: Any) -> None:
+        self.notifications += 1
+        self.invalidate()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def _current(self, session: AsyncSession) -> tuple[TagSnapshot, bool]:
+        if self._is_fresh():
+            return self._snapshot, False
+        async with self._lock:
+            if self._is_fresh():
+                return self._snapshot, False
+            generation = self._generation
+            result = await session.execute(select(*_columns()))
+            self._snapshot = TagSnapshot(
+                version=self._snapshot.version + 1,
+                tags={row.entity_id: CatalogTag(**row._mapping) for row in result},
+            )
+            self.reloads += 1
+            # A change announced while the tags were read keeps the snapshot
+            # stale, so the next lookup reads them again.
+            if generation == self._generation:
+                self._loaded_at = time.monotonic()
+            return self._snapshot, True
+
+
+def _columns() -> tuple[Any, ...]:
+    return (
+        Tag.entity_id,
+        Tag.name,
+        Tag.user_id,
+        Tag.version,
+        Tag.created_at,
+        Tag.updated_at,
+    )
+
+
+tag_catalog = TagCatalog(ttl=settings.TAG_CATALOG_TTL_SECONDS)
@@ -3,12 +3,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
+from app.core.counters import tag_post_count
 from app.core.db import Base
-from app.core.mixins import SoftDeleteMixin, TimestampMixin
+from app.core.mixins import SoftDeleteMixin, TimestampMixin, VersionMixin
 from app.posts.models import post_tags
 
 if TYPE_CHECKING:
@@ -16,8 +17,35 @@ if TYPE_CHECKING:
     from app.posts.models import Post
 
 
-class Tag(Base, TimestampMixin, SoftDeleteMixin):
+class Tag(Base, TimestampMixin, SoftDeleteMixin, VersionMixin):
     __tablename__ = "tags"
+    __table_args__ = (
+        Index(
+            "ix_tags_created_at_entity_id",
+            "created_at",
+            "entity_id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index("ix_tags_updated_at", "updated_at"),
+        Index(
+            "ix_tags_deleted_at",
+            "deleted_at",
+            postgresql_where=text("is_deleted = true"),
+        ),
+        # Autocomplete: the C collation lets one btree serve both the prefix
+        # LIKE and its ORDER BY; the trigram index serves fuzzy matching.
+        Index(
+            "ix_tags_name_prefix",
+            text('lower(name) COLLATE "C"'),
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index(
+            "ix_tags_name_trgm",
+            text("lower(name) gin_trgm_ops"),
+            postgresql_using="gin",
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
 
     entity_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -26,6 +54,10 @@ class Tag(Base, TimestampMixin, SoftDeleteMixin):
     user_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.entity_id"), nullable=False
     )
+    # Only tag endpoints need it; everywhere else it stays out of the SELECT.
+    post_count: Mapped[int] = column_property(
+        tag_post_count(entity_id), deferred=True, raiseload=True
+    )
     user: Mapped[User] = relationship("User")
     posts: Mapped[list[Post]] = relationship(
         "Post", secondary=post_tags, back_populates="tags"
@@ -1,35 +1,40 @@
-from collections.abc import AsyncGenerator
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
 from app.auth.models import User
-from app.core.db import async_session
-from app.core.exceptions import PermissionDeniedError
-from app.core.schemas import PaginatedResponse
-from app.tags.schemas import CreateTag, TagResponse, UpdateTag
+from app.core.conditional import (
+    if_match_versions,
+    is_not_modified,
+    make_versioned_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.core.db import get_session
+from app.core.exceptions import BadRequestError
+from app.core.pagination import SortOrder, next_cursor
+from app.core.responses import ModelResponse
+from app.core.schemas import BulkChangeResponse, BulkIds, PaginatedResponse
+from app.core.settings import settings
+from app.posts.cache import invalidate_posts_with_tags
+from app.tags.schemas import CreateTag, TagResponse, TagSuggestion, UpdateTag
 from app.tags.services import TagService
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
-        yield session
-
-
 @router.post("", response_model=TagResponse, status_code=201)
 async def create_tag(
     tag_data: CreateTag,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> TagResponse:
+) -> ModelResponse:
     service = TagService(session)
     tag = await service.create_tag(tag_data, current_user.entity_id)
-    return TagResponse.model_validate(tag)
+    return ModelResponse(TagResponse.model_validate(tag), status_code=201)
 
 
 @router.get("", response_model=PaginatedResponse[TagResponse], status_code=200)
@@ -38,47 +43,138 @@ async def list_tags(
     page: Annotated[int, Query(ge=1)] = 1,
     size: Annotated[int, Query(ge=1, le=100)] = 10,
     only_deleted: Annotated[bool, Query()] = False,
-) -> PaginatedResponse[TagResponse]:
+    cursor: Annotated[str | None, Query()] = None,
+    order: Annotated[SortOrder, Query()] = "desc",
+    include_total: Annotated[bool, Query()] = True,
+) -> ModelResponse:
     service = TagService(session)
-    tags, total = await service.list_tags(page, size, only_deleted)
-    return PaginatedResponse(
-        items=[TagResponse.model_validate(tag) for tag in tags], total=total
+    tags, total = await service.list_tags(
+        page, size, only_deleted, cursor, order, include_total
+    )
+    return ModelResponse(
+        PaginatedResponse(
+            items=[TagResponse.model_validate(tag) for tag in tags],
+            total=total,
+            next_cursor=next_cursor(tags, size),
+        )
     )
 
 
+@router.get("/popular", response_model=PaginatedResponse[TagResponse], status_code=200)
+async def list_popular_tags(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+) -> ModelResponse:
+    service = TagService(session)
+    tags = await service.list_popular_tags(limit)
+    return ModelResponse(
+        PaginatedResponse(items=[TagResponse.model_validate(tag) for tag in tags])
+    )
+
+
+@router.get(
+    "/autocomplete",
+    response_model=PaginatedResponse[TagSuggestion],
+    status_code=200,
+)
+async def autocomplete_tags(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    prefix: Annotated[str, Query(min_length=1, max_length=100)],
+    fuzzy: Annotated[bool, Query()] = False,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> ModelResponse:
+    service = TagService(session)
+    matches = await service.autocomplete_tags(prefix, limit, fuzzy)
+    return ModelResponse(
+        PaginatedResponse(
+            items=[
+                TagSuggestion(entity_id=entity_id, name=name)
+                for entity_id, name in matches
+            ]
+        )
+    )
+
+
+async def _set_tags_deleted(
+    body: BulkIds, user_id: UUID, session: AsyncSession, deleted: bool
+) -> ModelResponse:
+    tag_ids = list(dict.fromkeys(body.ids))
+    if len(tag_ids) > settings.BULK_DELETE_MAX_IDS:
+        raise BadRequestError(f"At most {settings.BULK_DELETE_MAX_IDS} ids per request")
+
+    service = TagService(session)
+    affected, not_found, forbidden = await service.set_tags_deleted(
+        tag_ids, user_id, deleted
+    )
+    if affected:
+        await invalidate_posts_with_tags(session, affected)
+    return ModelResponse(
+        BulkChangeResponse(affected=affected, not_found=not_found, forbidden=forbidden)
+    )
+
+
+@router.delete("", response_model=BulkChangeResponse, status_code=200)
+async def bulk_delete_tags(
+    body: BulkIds,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    return await _set_tags_deleted(body, current_user.entity_id, session, deleted=True)
+
+
+@router.post("/restore", response_model=BulkChangeResponse, status_code=200)
+async def bulk_restore_tags(
+    body: BulkIds,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ModelResponse:
+    return await _set_tags_deleted(body, current_user.entity_id, session, deleted=False)
+
+
 @router.get("/{entity_id}", response_model=TagResponse, status_code=200)
 async def get_tag(
     entity_id: UUID,
+    request: Request,
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> TagResponse:
+) -> Response:
     service = TagService(session)
+    version, last_modified, post_count = await service.get_tag_validators(entity_id)
+    headers = validator_headers(
+        make_versioned_etag(version, entity_id, last_modified.isoformat(), post_count),
+        last_modified,
+    )
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+
     tag = await service.get_tag(entity_id)
-    return TagResponse.model_validate(tag)
+    return ModelResponse(TagResponse.model_validate(tag), headers=headers)
 
 
 @router.put("/{entity_id}", response_model=TagResponse, status_code=200)
 async def update_tag(
     entity_id: UUID,
     update_data: UpdateTag,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> TagResponse:
+) -> ModelResponse:
     service = TagService(session)
-    tag = await service.get_tag(entity_id)
-    if tag.user_id != current_user.entity_id:
-        raise PermissionDeniedError("Not authorized")
-    tag = await service.update_tag(entity_id, update_data)
-    return TagResponse.model_validate(tag)
+    tag = await service.update_tag(
+        entity_id, update_data, current_user.entity_id, if_match_versions(request)
+    )
+    await invalidate_posts_with_tags(session, [entity_id])
+    return ModelResponse(TagResponse.model_validate(tag))
 
 
 @router.delete("/{entity_id}", status_code=204)
 async def delete_tag(
     entity_id: UUID,
+    request: Request,
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_session)],
 ) -> None:
     service = TagService(session)
-    tag = await service.get_tag(entity_id)
-    if tag.user_id != current_user.entity_id:
-        raise PermissionDeniedError("Not authorized")
-    await service.delete_tag(entity_id)
+    await service.delete_tag(
+        entity_id, current_user.entity_id, if_match_versions(request)
+    )
+    await invalidate_posts_with_tags(session, [entity_id])
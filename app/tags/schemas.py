@@ -13,8 +13,18 @@ class UpdateTag(BaseModel):
     name: str | None = Field(None, min_length=1, max_length=100)
 
 
-class TagResponse(TimestampSchema, SoftDeleteSchema):
+class TagSummary(TimestampSchema, SoftDeleteSchema):
     entity_id: UUID
     name: str
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TagResponse(TagSummary):
+    post_count: int
+
+
+class TagSuggestion(BaseModel):
+    entity_id: UUID
+    name: str
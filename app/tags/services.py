@@ -1,9 +1,19 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.counters import TagPostCount, bump_change_count, tag_post_count
+from app.core.exceptions import ResourceNotFoundError
 from app.core.mixins import CRUDMixin
+from app.core.pagination import SortOrder
+from app.core.settings import settings
+from app.posts.models import Post
+from app.tags.autocomplete import tag_name_index
+from app.tags.catalog import tag_catalog
 from app.tags.models import Tag
 from app.tags.schemas import CreateTag, UpdateTag
 
@@ -14,29 +24,143 @@ class TagService(CRUDMixin):
 
     async def create_tag(self, tag_data: CreateTag, user_id: UUID) -> Tag:
         tag = Tag(**tag_data.model_dump(), user_id=user_id)
-        return await self.create(tag)
+        await tag_catalog.publish_change(self.session)
+        tag = await self.create(tag)
+        tag_catalog.invalidate()
+        set_committed_value(tag, "post_count", 0)
+        return tag
 
     async def get_tag(self, entity_id: UUID) -> Tag:
-        return await self.get_by_id(Tag, entity_id)
+        result = await self.session.execute(
+            select(Tag)
+            .options(undefer(Tag.post_count))
+            .where(Tag.entity_id == entity_id)
+        )
+        tag = result.scalar_one_or_none()
+        if tag is None:
+            raise ResourceNotFoundError("Resource not found")
+        return tag
 
-    async def update_tag(self, entity_id: UUID, update_data: UpdateTag) -> Tag:
-        tag = await self.get_tag(entity_id)
-        update_dict = update_data.model_dump(exclude_unset=True)
-        return await self.update(tag, update_dict)
+    async def get_tag_validators(self, entity_id: UUID) -> tuple[int, datetime, int]:
+        # post_count moves without touching the tag row, so it goes into the
+        # ETag and the counter's own timestamp into Last-Modified.
+        result = await self.session.execute(
+            select(
+                Tag.version,
+                func.greatest(Tag.updated_at, TagPostCount.updated_at),
+                func.coalesce(TagPostCount.post_count, 0),
+            )
+            .outerjoin(TagPostCount, TagPostCount.tag_id == Tag.entity_id)
+            .where(Tag.entity_id == entity_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise ResourceNotFoundError("Resource not found")
+        version, last_modified, post_count = row
+        return version, last_modified, post_count
 
-    async def delete_tag(self, entity_id: UUID) -> None:
-        tag = await self.get_tag(entity_id)
-        await self.delete(tag)
+    async def update_tag(
+        self,
+        entity_id: UUID,
+        update_data: UpdateTag,
+        user_id: UUID,
+        expected_versions: list[int] | None = None,
+    ) -> Row:
+        # The RETURNING row carries every tag column and the post count, so
+        # nothing is re-read.
+        row = await self.update_owned(
+            Tag,
+            entity_id,
+            user_id,
+            update_data.model_dump(exclude_unset=True),
+            expected_versions,
+            extra_columns=[
+                lambda updated: tag_post_count(updated.c.entity_id).label("post_count")
+            ],
+        )
+        await self._commit_catalog_change()
+        return row
 
-    async def list_tags(
-        self, page: int = 1, size: int = 10, only_deleted: bool = False
-    ) -> tuple[list[Tag], int]:
-        tags = await self.list_paginated(Tag, page, size, only_deleted)
-        count_stmt = select(func.count(Tag.entity_id))
-        if only_deleted:
-            count_stmt = count_stmt.where(Tag.is_deleted)
+    async def delete_tag(
+        self,
+        entity_id: UUID,
+        user_id: UUID,
+        expected_versions: list[int] | None = None,
+    ) -> None:
+        await self.soft_delete_owned(Tag, entity_id, user_id, expected_versions)
+        await self._commit_catalog_change()
+
+    async def set_tags_deleted(
+        self, tag_ids: list[UUID], user_id: UUID, deleted: bool
+    ) -> tuple[list[UUID], list[UUID], list[UUID]]:
+        result = await self.set_deleted_owned(Tag, tag_ids, user_id, deleted)
+        if result[0]:
+            await self._commit_catalog_change()
         else:
-            count_stmt = count_stmt.where(Tag.is_deleted == False)  # noqa: E712
-        count_result = await self.session.execute(count_stmt)
-        total = count_result.scalar()
+            await self.session.commit()
+        return result
+
+    async def _commit_catalog_change(self) -> None:
+        # Other workers drop their catalog snapshot on the NOTIFY, which is
+        # only delivered if this commit goes through; this one drops it now.
+        # Posts embed their tags, so post listings change as well.
+        await tag_catalog.publish_change(self.session)
+        await bump_change_count(self.session, Post.__tablename__)
+        await self.session.commit()
+        tag_catalog.invalidate()
+
+    async def list_tags(
+        self,
+        page: int = 1,
+        size: int = 10,
+        only_deleted: bool = False,
+        cursor: str | None = None,
+        order: SortOrder = "desc",
+        include_total: bool = True,
+    ) -> tuple[list[Tag], int | None]:
+        tags = await self.list_paginated(
+            Tag, page, size, only_deleted, cursor, order, [undefer(Tag.post_count)]
+        )
+        total = await self.count(Tag, only_deleted) if include_total else None
         return tags, total
+
+    async def autocomplete_tags(
+        self, prefix: str, limit: int = 10, fuzzy: bool = False
+    ) -> list[tuple[UUID, str]]:
+        # Prefix lookups filter and sort on lower(name) COLLATE "C", matching
+        # ix_tags_name_prefix, so they are an index range scan that stops at
+        # the LIMIT. Fuzzy lookups match the plain expression that the trigram
+        # index covers (LIKE and %), ranking prefix hits first and then by
+        # similarity.
+        if settings.TAG_AUTOCOMPLETE_SOURCE == "memory" and not fuzzy:
+            return await tag_name_index.search(self.session, prefix, limit)
+
+        name = func.lower(Tag.name)
+        query = prefix.lower()
+        is_prefix = name.startswith(query, autoescape=True)
+        stmt = select(Tag.entity_id, Tag.name).limit(limit)
+        if fuzzy:
+            stmt = stmt.where(is_prefix | name.op("%")(query)).order_by(
+                is_prefix.desc(), func.similarity(name, query).desc(), name
+            )
+        else:
+            key = name.collate("C")
+            stmt = stmt.where(key.startswith(query, autoescape=True)).order_by(key)
+        result = await self.session.execute(stmt)
+        return list(result.tuples())
+
+    async def list_popular_tags(self, limit: int = 10) -> list[Tag]:
+        # Walks ix_tag_post_counts_post_count_tag_id backwards; deleted tags
+        # are skipped by the soft-delete criteria.
+        result = await self.session.execute(
+            select(Tag, TagPostCount.post_count)
+            .join(TagPostCount, TagPostCount.tag_id == Tag.entity_id)
+            .where(TagPostCount.post_count > 0)
+            .order_by(TagPostCount.post_count.desc(), TagPostCount.tag_id.desc())
+            .limit(limit)
+        )
+        tags = []
+        for tag, post_count in result.tuples():
+            set_committed_value(tag, "post_count", post_count)
+            tags.append(tag)
+        return tags
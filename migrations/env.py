@@ -2,6 +2,8 @@ from logging.config import fileConfig
 
 from alembic import context
 
+from app.archival.models import posts_archive  # noqa
+from app.core.counters import ChangeCount, RowCount, TagPostCount  # noqa
 from app.core.db import Base
 from app.core.settings import settings
 from app.posts.models import Post  # noqa
@@ -0,0 +1,73 @@
+"""Case-insensitive unique user email
+
+Revision ID: 3c1f7b2d9e40
+Revises: ba5720441a5c
+Create Date: 2026-10-18 09:12:40.118203
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f7b2d9e40"
+down_revision: str | Sequence[str] | None = "ba5720441a5c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# How many conflicting addresses the abort message lists.
+MAX_REPORTED_CONFLICTS = 20
+
+
+def _check_case_variant_emails() -> None:
+    # Emails that differ only in case passed the old constraint, but the new
+    # index fails on them with an IntegrityError naming just one key. Which
+    # account keeps the address is an owner's call, so stop and list them all.
+    conflicts = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT lower(email) AS email, array_agg(email ORDER BY created_at)"
+                " AS variants FROM users GROUP BY lower(email)"
+                " HAVING count(*) > 1 ORDER BY lower(email)"
+            )
+        )
+        .all()
+    )
+    if not conflicts:
+        return
+    listed = "\n".join(
+        f"  {row.email}: {', '.join(row.variants)}"
+        for row in conflicts[:MAX_REPORTED_CONFLICTS]
+    )
+    more = len(conflicts) - MAX_REPORTED_CONFLICTS
+    if more > 0:
+        listed += f"\n  ... and {more} more"
+    raise RuntimeError(
+        f"{len(conflicts)} email addresses are registered more than once with"
+        f" different case:\n{listed}\n"
+        "Merge or rename those accounts so each lower(email) is unique, then"
+        " run the upgrade again."
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not context.is_offline_mode():
+        _check_case_variant_emails()
+    # Replace the case-sensitive unique constraint with a functional index
+    op.drop_constraint("users_email_key", "users", type_="unique")
+    op.create_index(
+        "ix_users_email_lower",
+        "users",
+        [sa.text("lower(email)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_email_lower", table_name="users")
+    op.create_unique_constraint("users_email_key", "users", ["email"])
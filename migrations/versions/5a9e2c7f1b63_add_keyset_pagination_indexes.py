@@ -0,0 +1,31 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5a9e2c7f1b63
+Revises: 3c1f7b2d9e40
+Create Date: 2026-10-18 10:03:27.561904
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a9e2c7f1b63"
+down_revision: str | Sequence[str] | None = "3c1f7b2d9e40"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_posts_created_at_entity_id", "posts", ["created_at", "entity_id"]
+    )
+    op.create_index("ix_tags_created_at_entity_id", "tags", ["created_at", "entity_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tags_created_at_entity_id", table_name="tags")
+    op.drop_index("ix_posts_created_at_entity_id", table_name="posts")
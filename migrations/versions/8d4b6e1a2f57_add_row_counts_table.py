@@ -0,0 +1,41 @@
+"""Add row_counts table
+
+Revision ID: 8d4b6e1a2f57
+Revises: 5a9e2c7f1b63
+Create Date: 2026-10-18 10:41:05.293318
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4b6e1a2f57"
+down_revision: str | Sequence[str] | None = "5a9e2c7f1b63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "row_counts",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.Column("total", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("table_name", "is_deleted"),
+    )
+    # Seed the counters from the current table contents
+    for table_name in ("posts", "tags"):
+        op.execute(
+            f"INSERT INTO row_counts (table_name, is_deleted, total) "
+            f"SELECT '{table_name}', is_deleted, count(*) "
+            f"FROM {table_name} GROUP BY is_deleted"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("row_counts")
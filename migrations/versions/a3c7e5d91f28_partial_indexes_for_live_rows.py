@@ -0,0 +1,60 @@
+"""Make keyset and search indexes partial on live rows
+
+Revision ID: a3c7e5d91f28
+Revises: f4a1d8e2b736
+Create Date: 2026-10-18 13:21:08.417392
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c7e5d91f28"
+down_revision: str | Sequence[str] | None = "f4a1d8e2b736"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LIVE_ROWS = sa.text("is_deleted = false")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_posts_created_at_entity_id", table_name="posts")
+    op.create_index(
+        "ix_posts_created_at_entity_id",
+        "posts",
+        ["created_at", "entity_id"],
+        postgresql_where=LIVE_ROWS,
+    )
+    op.drop_index("ix_tags_created_at_entity_id", table_name="tags")
+    op.create_index(
+        "ix_tags_created_at_entity_id",
+        "tags",
+        ["created_at", "entity_id"],
+        postgresql_where=LIVE_ROWS,
+    )
+    op.drop_index("ix_posts_search_vector", table_name="posts")
+    op.create_index(
+        "ix_posts_search_vector",
+        "posts",
+        ["search_vector"],
+        postgresql_using="gin",
+        postgresql_where=LIVE_ROWS,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_posts_search_vector", table_name="posts")
+    op.create_index(
+        "ix_posts_search_vector", "posts", ["search_vector"], postgresql_using="gin"
+    )
+    op.drop_index("ix_tags_created_at_entity_id", table_name="tags")
+    op.create_index("ix_tags_created_at_entity_id", "tags", ["created_at", "entity_id"])
+    op.drop_index("ix_posts_created_at_entity_id", table_name="posts")
+    op.create_index(
+        "ix_posts_created_at_entity_id", "posts", ["created_at", "entity_id"]
+    )
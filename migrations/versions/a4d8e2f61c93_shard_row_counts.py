@@ -0,0 +1,47 @@
+"""Shard row_counts across slot rows
+
+Revision ID: a4d8e2f61c93
+Revises: f1b7d4e9a358
+Create Date: 2026-10-18 17:05:21.648310
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8e2f61c93"
+down_revision: str | Sequence[str] | None = "f1b7d4e9a358"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing totals become slot 0 of their key
+    op.add_column(
+        "row_counts",
+        sa.Column("slot", sa.SmallInteger(), server_default="0", nullable=False),
+    )
+    op.drop_constraint("row_counts_pkey", "row_counts", type_="primary")
+    op.create_primary_key(
+        "row_counts_pkey", "row_counts", ["table_name", "is_deleted", "slot"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold every slot back into slot 0 before dropping the column
+    op.execute(
+        "INSERT INTO row_counts (table_name, is_deleted, slot, total) "
+        "SELECT table_name, is_deleted, 0, sum(total) FROM row_counts "
+        "GROUP BY table_name, is_deleted "
+        "ON CONFLICT (table_name, is_deleted, slot) "
+        "DO UPDATE SET total = EXCLUDED.total"
+    )
+    op.execute("DELETE FROM row_counts WHERE slot <> 0")
+    op.drop_constraint("row_counts_pkey", "row_counts", type_="primary")
+    op.create_primary_key("row_counts_pkey", "row_counts", ["table_name", "is_deleted"])
+    op.drop_column("row_counts", "slot")
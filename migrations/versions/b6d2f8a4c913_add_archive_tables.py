@@ -0,0 +1,83 @@
+"""Add archive tables for soft-deleted posts and tags
+
+Revision ID: b6d2f8a4c913
+Revises: a3c7e5d91f28
+Create Date: 2026-10-18 13:52:44.906215
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d2f8a4c913"
+down_revision: str | Sequence[str] | None = "a3c7e5d91f28"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _archived_at() -> sa.Column:
+    return sa.Column(
+        "archived_at",
+        sa.DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "posts_archive",
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        _archived_at(),
+        sa.PrimaryKeyConstraint("entity_id"),
+    )
+    op.create_table(
+        "tags_archive",
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        _archived_at(),
+        sa.PrimaryKeyConstraint("entity_id"),
+    )
+    op.create_table(
+        "post_tags_archive",
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tag_id", postgresql.UUID(as_uuid=True), nullable=False),
+        _archived_at(),
+        sa.PrimaryKeyConstraint("post_id", "tag_id"),
+    )
+    op.create_index(
+        "ix_posts_deleted_at",
+        "posts",
+        ["deleted_at"],
+        postgresql_where=sa.text("is_deleted = true"),
+    )
+    op.create_index(
+        "ix_tags_deleted_at",
+        "tags",
+        ["deleted_at"],
+        postgresql_where=sa.text("is_deleted = true"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tags_deleted_at", table_name="tags")
+    op.drop_index("ix_posts_deleted_at", table_name="posts")
+    op.drop_table("post_tags_archive")
+    op.drop_table("tags_archive")
+    op.drop_table("posts_archive")
@@ -0,0 +1,47 @@
+"""Add change_counts table
+
+Revision ID: b7e3f9a02d16
+Revises: a4d8e2f61c93
+Create Date: 2026-10-18 17:48:09.204715
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3f9a02d16"
+down_revision: str | Sequence[str] | None = "a4d8e2f61c93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "change_counts",
+        sa.Column("name", sa.String(length=63), nullable=False),
+        sa.Column("slot", sa.SmallInteger(), server_default="0", nullable=False),
+        sa.Column("total", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name", "slot"),
+    )
+    # Seed the post listing key so existing Last-Modified values carry over
+    op.execute(
+        "INSERT INTO change_counts (name, slot, total, changed_at) "
+        "SELECT 'posts', 0, 0, greatest("
+        "(SELECT max(updated_at) FROM posts), (SELECT max(updated_at) FROM tags)) "
+        "WHERE EXISTS (SELECT 1 FROM posts) OR EXISTS (SELECT 1 FROM tags)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("change_counts")
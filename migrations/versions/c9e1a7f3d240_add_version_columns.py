@@ -0,0 +1,36 @@
+"""Add version columns to posts and tags
+
+Revision ID: c9e1a7f3d240
+Revises: b6d2f8a4c913
+Create Date: 2026-10-18 14:26:13.552081
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e1a7f3d240"
+down_revision: str | Sequence[str] | None = "b6d2f8a4c913"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "posts",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "tags",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tags", "version")
+    op.drop_column("posts", "version")
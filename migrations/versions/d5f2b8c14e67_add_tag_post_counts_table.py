@@ -0,0 +1,48 @@
+"""Add tag_post_counts table
+
+Revision ID: d5f2b8c14e67
+Revises: c9e1a7f3d240
+Create Date: 2026-10-18 15:02:47.318604
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f2b8c14e67"
+down_revision: str | Sequence[str] | None = "c9e1a7f3d240"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tag_post_counts",
+        sa.Column("tag_id", sa.UUID(), nullable=False),
+        sa.Column("post_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.entity_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("tag_id"),
+    )
+    op.create_index(
+        "ix_tag_post_counts_post_count_tag_id",
+        "tag_post_counts",
+        ["post_count", "tag_id"],
+        unique=False,
+    )
+    # Seed the counters from the links of live posts
+    op.execute(
+        "INSERT INTO tag_post_counts (tag_id, post_count) "
+        "SELECT post_tags.tag_id, count(*) FROM post_tags "
+        "JOIN posts ON posts.entity_id = post_tags.post_id "
+        "WHERE posts.is_deleted = false GROUP BY post_tags.tag_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tag_post_counts_post_count_tag_id", table_name="tag_post_counts")
+    op.drop_table("tag_post_counts")
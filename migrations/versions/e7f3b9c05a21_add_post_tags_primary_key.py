@@ -0,0 +1,39 @@
+"""Add post_tags primary key and reverse index
+
+Revision ID: e7f3b9c05a21
+Revises: c2e8a4f61d95
+Create Date: 2026-10-18 12:08:14.637450
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7f3b9c05a21"
+down_revision: str | Sequence[str] | None = "c2e8a4f61d95"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop incomplete and duplicated associations before adding the key
+    op.execute("DELETE FROM post_tags WHERE post_id IS NULL OR tag_id IS NULL")
+    op.execute(
+        "DELETE FROM post_tags a USING post_tags b "
+        "WHERE a.ctid < b.ctid AND a.post_id = b.post_id AND a.tag_id = b.tag_id"
+    )
+    op.alter_column("post_tags", "post_id", nullable=False)
+    op.alter_column("post_tags", "tag_id", nullable=False)
+    op.create_primary_key("post_tags_pkey", "post_tags", ["post_id", "tag_id"])
+    op.create_index("ix_post_tags_tag_id_post_id", "post_tags", ["tag_id", "post_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_tags_tag_id_post_id", table_name="post_tags")
+    op.drop_constraint("post_tags_pkey", "post_tags", type_="primary")
+    op.alter_column("post_tags", "tag_id", nullable=True)
+    op.alter_column("post_tags", "post_id", nullable=True)
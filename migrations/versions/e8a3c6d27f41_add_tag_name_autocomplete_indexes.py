@@ -0,0 +1,45 @@
+"""Add tag name autocomplete indexes
+
+Revision ID: e8a3c6d27f41
+Revises: d5f2b8c14e67
+Create Date: 2026-10-18 15:37:09.846215
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a3c6d27f41"
+down_revision: str | Sequence[str] | None = "d5f2b8c14e67"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_tags_name_prefix",
+        "tags",
+        [sa.text('lower(name) COLLATE "C"')],
+        unique=False,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+    op.create_index(
+        "ix_tags_name_trgm",
+        "tags",
+        [sa.text("lower(name) gin_trgm_ops")],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm is left installed; other objects may depend on it
+    op.drop_index("ix_tags_name_trgm", table_name="tags")
+    op.drop_index("ix_tags_name_prefix", table_name="tags")
@@ -0,0 +1,36 @@
+"""Add updated_at to tag_post_counts
+
+Revision ID: f1b7d4e9a358
+Revises: e8a3c6d27f41
+Create Date: 2026-10-18 16:12:40.527193
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b7d4e9a358"
+down_revision: str | Sequence[str] | None = "e8a3c6d27f41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tag_post_counts",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tag_post_counts", "updated_at")
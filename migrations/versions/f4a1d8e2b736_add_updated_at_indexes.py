@@ -0,0 +1,29 @@
+"""Add updated_at indexes for conditional requests
+
+Revision ID: f4a1d8e2b736
+Revises: e7f3b9c05a21
+Create Date: 2026-10-18 12:47:31.290564
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a1d8e2b736"
+down_revision: str | Sequence[str] | None = "e7f3b9c05a21"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_posts_updated_at", "posts", ["updated_at"])
+    op.create_index("ix_tags_updated_at", "tags", ["updated_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tags_updated_at", table_name="tags")
+    op.drop_index("ix_posts_updated_at", table_name="posts")
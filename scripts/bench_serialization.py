@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy.orm import configure_mappers
+
+import app.app  # noqa: F401  (registers every mapper)
+from app.auth.models import User
+from app.core.responses import ModelResponse
+from app.core.schemas import PaginatedResponse
+from app.posts.models import Post
+from app.posts.schemas import PostPartialResponse, PostResponse
+from app.tags.models import Tag
+
+logger = logging.getLogger(__name__)
+
+# The response_model list_posts declares, which FastAPI validated and encoded
+# again before handlers returned ModelResponse.
+LIST_POSTS_FIELD = create_model_field(
+    "Response_list_posts",
+    PaginatedResponse[PostResponse] | PaginatedResponse[PostPartialResponse],
+    mode="serialization",
+)
+
+
+def make_posts(items: int, tags_per_post: int, content_size: int) -> list[Post]:
+    now = datetime.now(UTC)
+    user = User(
+        entity_id=uuid4(),
+        name="Bench",
+        last_name="User",
+        email="bench@example.com",
+        hashed_password="x",
+        created_at=now,
+        updated_at=now,
+    )
+    tags = [
+        Tag(
+            entity_id=uuid4(),
+            name=f"tag-{index}",
+            user_id=user.entity_id,
+            version=1,
+            created_at=now,
+            updated_at=now,
+            is_deleted=False,
+            deleted_at=None,
+        )
+        for index in range(tags_per_post)
+    ]
+    return [
+        Post(
+            entity_id=uuid4(),
+            title=f"Post {index}",
+            content="x" * content_size,
+            version=1,
+            user_id=user.entity_id,
+            user=user,
+            tags=tags,
+            created_at=now,
+            updated_at=now,
+            is_deleted=False,
+            deleted_at=None,
+        )
+        for index in range(items)
+    ]
+
+
+def build_page(posts: list[Post]) -> PaginatedResponse:
+    return PaginatedResponse(
+        items=[PostResponse.model_validate(post) for post in posts], total=len(posts)
+    )
+
+
+async def render_before(posts: list[Post]) -> bytes:
+    # Handler model_validate, then FastAPI's response_model validation and
+    # jsonable_encoder, then json.dumps in JSONResponse.
+    content = await serialize_response(
+        field=LIST_POSTS_FIELD, response_content=build_page(posts)
+    )
+    return JSONResponse(content).body
+
+
+async def render_after(posts: list[Post]) -> bytes:
+    return ModelResponse(build_page(posts)).body
+
+
+async def measure(
+    render: Callable[[list[Post]], Awaitable[bytes]], posts: list[Post], repeat: int
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await render(posts)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def _main(args: argparse.Namespace) -> None:
+    configure_mappers()
+    posts = make_posts(args.items, args.tags, args.content_size)
+    before, after = await render_before(posts), await render_after(posts)
+    if json.loads(before) != json.loads(after):
+        raise SystemExit("The two paths render different JSON")
+
+    for label, render in (("before", render_before), ("after", render_after)):
+        seconds = await measure(render, posts, args.repeat)
+        logger.info(
+            "%s: %.2f ms per page, %.1f us per item",
+            label,
+            seconds * 1e3,
+            seconds * 1e6 / args.items,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time a list_posts page rendered through response_model and "
+            "jsonable_encoder against ModelResponse."
+        )
+    )
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--content-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import delete, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.app  # noqa: F401  (registers every mapper)
+from app.auth.models import User
+from app.core.db import engine
+from app.core.settings import settings
+from app.posts.models import Post, post_tags
+from app.tags.models import Tag
+
+
+async def _can_connect() -> bool:
+    dsn = (
+        make_url(settings.DATABASE_URL)
+        .set(drivername="postgresql")
+        .render_as_string(hide_password=False)
+    )
+    try:
+        connection = await asyncpg.connect(dsn, timeout=2)
+    except Exception:
+        return False
+    await connection.close()
+    return True
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    if not asyncio.run(_can_connect()):
+        pytest.skip("Postgres at DATABASE_URL is not reachable")
+    command.upgrade(Config("alembic.ini"), "head")
+
+
+@pytest.fixture
+def run(database) -> Callable[[Coroutine[Any, Any, Any]], Any]:
+    # Each test gets its own event loop, so pooled connections opened on it
+    # are dropped before the loop closes.
+    def _run(coroutine: Coroutine[Any, Any, Any]) -> Any:
+        async def main() -> Any:
+            try:
+                return await coroutine
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return _run
+
+
+async def create_user(session: AsyncSession) -> User:
+    user = User(
+        name="Test",
+        last_name="User",
+        email=f"{uuid4().hex}@example.com",
+        hashed_password="not-a-hash",
+    )
+    session.add(user)
+    await session.commit()
+    return user
+
+
+async def create_tag(session: AsyncSession, user_id: UUID) -> Tag:
+    tag = Tag(name=f"tag-{uuid4().hex[:12]}", user_id=user_id)
+    session.add(tag)
+    await session.commit()
+    return tag
+
+
+async def drop_user(session: AsyncSession, user_id: UUID) -> None:
+    user_posts = select(Post.entity_id).where(Post.user_id == user_id)
+    await session.execute(delete(post_tags).where(post_tags.c.post_id.in_(user_posts)))
+    await session.execute(delete(Post).where(Post.user_id == user_id))
+    await session.execute(delete(Tag).where(Tag.user_id == user_id))
+    await session.execute(delete(User).where(User.entity_id == user_id))
+    await session.commit()
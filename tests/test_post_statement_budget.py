@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from app.app import app
+from app.auth.services import AuthService
+from app.core.db import async_session, engine
+from app.core.settings import settings
+from app.posts.routes import CREATE_POST_STATEMENT_BUDGET
+from tests.conftest import create_user, drop_user
+
+
+@contextmanager
+def count_statements() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_create_post_stays_within_its_statement_budget(run):
+    async def scenario() -> None:
+        async with async_session() as session:
+            user = await create_user(session)
+        token = AuthService.create_access_token({"sub": str(user.entity_id)})
+        client = AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url=f"http://test{settings.API_V1_PREFIX}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        try:
+            # Creating the tag also caches the user, and marks the tag catalog
+            # stale, so the post below pays for the catalog reload.
+            response = await client.post("/tags", json={"name": f"t-{user.email}"})
+            assert response.status_code == 201
+            tag_id = response.json()["entity_id"]
+
+            with count_statements() as statements:
+                response = await client.post(
+                    "/posts",
+                    json={
+                        "title": "Statement budget",
+                        "content": "Counts the SQL behind one post.",
+                        "tags": [tag_id],
+                    },
+                )
+            assert response.status_code == 201
+            assert [tag["entity_id"] for tag in response.json()["tags"]] == [tag_id]
+            assert len(statements) <= CREATE_POST_STATEMENT_BUDGET, statements
+        finally:
+            await client.aclose()
+            async with async_session() as session:
+                await drop_user(session, user.entity_id)
+
+    run(scenario())
@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import suppress
+
+from sqlalchemy import update
+
+from app.core.db import async_session
+from app.tags.catalog import TagCatalog
+from app.tags.models import Tag
+from tests.conftest import create_tag, create_user, drop_user
+
+NOTIFY_TIMEOUT_SECONDS = 5.0
+
+
+async def _soft_delete(session, catalog: TagCatalog, tag: Tag) -> None:
+    await session.execute(
+        update(Tag).where(Tag.entity_id == tag.entity_id).values(is_deleted=True)
+    )
+    await catalog.publish_change(session)
+    await session.commit()
+
+
+async def _wait_for_notification(catalog: TagCatalog, seen: int) -> None:
+    async with asyncio.timeout(NOTIFY_TIMEOUT_SECONDS):
+        while catalog.notifications == seen:
+            await asyncio.sleep(0.05)
+
+
+def test_resolve_looks_up_unknown_tags_and_keeps_stale_ones_until_invalidated(run):
+    async def scenario() -> None:
+        catalog = TagCatalog(ttl=300)
+        async with async_session() as session:
+            user = await create_user(session)
+            try:
+                first = await create_tag(session, user.entity_id)
+                assert first.entity_id in await catalog.resolve(
+                    session, [first.entity_id]
+                )
+                assert catalog.reloads == 1
+
+                # Created after the snapshot: found by a direct lookup.
+                second = await create_tag(session, user.entity_id)
+                assert second.entity_id in await catalog.resolve(
+                    session, [second.entity_id]
+                )
+                assert catalog.db_lookups == 1
+                # The lookup marked the snapshot stale; this reloads it.
+                assert second.entity_id in (await catalog.snapshot(session)).tags
+                assert catalog.reloads == 2
+
+                # Without a listener, a deletion only shows after invalidate().
+                await _soft_delete(session, catalog, first)
+                assert first.entity_id in (await catalog.snapshot(session)).tags
+                catalog.invalidate()
+                assert first.entity_id not in await catalog.resolve(
+                    session, [first.entity_id]
+                )
+            finally:
+                await drop_user(session, user.entity_id)
+
+    run(scenario())
+
+
+def test_listener_invalidates_the_catalog_on_notify(run):
+    async def scenario() -> None:
+        catalog = TagCatalog(ttl=300)
+        listener = asyncio.create_task(catalog.listen())
+        async with async_session() as session:
+            user = await create_user(session)
+            try:
+                # NOTIFY until the listener has subscribed and hears one.
+                async with asyncio.timeout(NOTIFY_TIMEOUT_SECONDS):
+                    while not catalog.notifications:
+                        await catalog.publish_change(session)
+                        await session.commit()
+                        await asyncio.sleep(0.05)
+
+                tag = await create_tag(session, user.entity_id)
+                assert tag.entity_id in await catalog.resolve(session, [tag.entity_id])
+
+                seen = catalog.notifications
+                await _soft_delete(session, catalog, tag)
+                await _wait_for_notification(catalog, seen)
+                assert tag.entity_id not in await catalog.resolve(
+                    session, [tag.entity_id]
+                )
+            finally:
+                listener.cancel()
+                with suppress(asyncio.CancelledError):
+                    await listener
+                await drop_user(session, user.entity_id)
+
+    run(scenario())